@@ -16,10 +16,28 @@ Inhalt 1.0.0.0-MASTER:
    - `load_options_settings()`: Lädt den Skalierungsfaktor aus einer JSON-Datei
    - `save_options_settings()`: Speichert den Skalierungsfaktor in eine JSON-Datei
    - `validate_index()`: Validiert Indexwerte für Listen
+   - `PositionIndex`: Pfad -> Position für Bildlisten (ersetzt list.index/remove)
    - `get_datetime_str()`: Liefert formatierten Zeitstempel
    - `copy_to_clipboard()`: Kopiert Text in die Zwischenablage
    - `load_image_with_cache()`: Lädt Bilder mit Caching-Mechanismus
+   - `load_thumbnail()` / `ThumbnailCache`: Vorschaubilder mit eigenem Dekodierpfad und Speicherbudget
+   - `load_exif_thumbnail()`: Nutzt eingebettete EXIF-Vorschaubilder von JPEGs
+   - `build_thumbnail_levels()` / `ThumbnailDiskCache`: Persistente Vorschaubilder in Standardgrößen (ganze Kette aus einer Dekodierung) mit LRU-Aufräumen
+   - `ThumbnailWorkerPool`: Erzeugt Vorschaubilder priorisiert in Hintergrund-Threads
+   - `ThumbnailProcessPool`: Optionales Prozess-Backend mit Shared-Memory-Rückgabe der Pixel
+   - `benchmark_thumbnail_backends()`: Vergleicht Thread- und Prozess-Backend (--benchmark-thumbnails)
+   - `load_reduced_image()`: Dekodiert Bilder reduziert in Zielgröße (JPEG-draft, reduce)
+   - `get_cached_frame()` / `store_cached_frame()`: LRU (nach Bytes) für fertig gerenderte Frames
+   - `frame_crop()` / `render_frame()`: Skaliert ein Bild und schneidet gezoomte Frames auf den sichtbaren Bereich zu
+   - `get_pooled_photo()`: Wiederverwendetes PhotoImage pro Anzeigefläche (paste statt Neuanlage)
    - `match_keyword()`: Prüft Keywords in Texten mit optionaler Ganztwort-Suche
+   - `KeywordMatcher` / `get_keyword_matcher()`: Aho-Corasick für das Highlighting aller Keywords in einem Durchlauf
+   - `get_compiled_regex()` / `RegexProcess`: Regex-Filter mit Musterspeicher, Auswertung im eigenen Prozess mit Zeitbudget
+   - `TrigramIndex`: Trigramm-Index über den Prompt für Infix- und tippfehlertolerante Suche
+   - `TokenIndex`: Invertierter Token-Index (Prompt, Negativ, Settings, Dateiname) für den Filter
+   - `parse_filter_query()`: Übersetzt die Filter-Abfragesprache in Klauseln
+   - `StatColumns`: Größe/ctime/mtime als Spalten, Größen- und Datumsfilter als Maske, die die Kandidaten auswählt (NumPy optional)
+   - `FilterPlan`: Kostenbasierter Plan (billige Prüfungen vor Metadaten, beobachtete Selektivität)
    - `extract_text_chunks()`: Extrahiert Prompt, Negative Prompt und Settings aus Bildmetadaten (JPEG/PNG)
 
 3. **UI-Größen- und Skalierungsfunktionen**
@@ -37,6 +55,7 @@ Inhalt 1.0.0.0-MASTER:
 
 5. **Filter- und Suchfunktionen**
    - `apply_filters()`: Wendet Filter auf Bilder an (Prompt, Datei, Größe, Datum)
+   - `schedule_live_filter()`: Suche beim Tippen (entprellt, laufende Auswertung wird abgebrochen)
    - `clear_filter_inputs()`: Löscht Filtereingaben
    - `reset_all_filters()`: Setzt alle Filter zurück
    - `update_filter_button_color()`: Aktualisiert Filter-Button-Farbe bei aktiven Filtern
@@ -49,6 +68,7 @@ Inhalt 1.0.0.0-MASTER:
    - `select_image_from_folder()`: Öffnet Bildauswahl-Dialog
    - `display_image_safe_async()`: Lädt und zeigt Bilder asynchron an
    - `_finalize_display_image()`: Finalisiert Bildanzeige mit Skalierung
+   - `render_progressive()`: Zweiphasiges Rendern (BILINEAR sofort, LANCZOS nach Ruhezeit)
    - `rescale_image()`: Skaliert aktuelles Bild neu
    - `show_next_image()` / `show_previous_image()`: Navigiert zwischen Bildern
    - `delete_current_image()`: Löscht aktuelles Bild
@@ -70,7 +90,11 @@ Inhalt 1.0.0.0-MASTER:
 9. **Zusätzliche Funktionen**
    - `open_options_window()`: Öffnet Optionsfenster zur Skalierungsanpassung
    - `show_debug_info()`: Zeigt Debug-Informationen an
-   - `populate_preview_table_lazy()`: Füllt Vorschauliste mit Lazy-Loading
+   - `on_thumb_size_change()`: Vorschaubildgröße per Schieberegler ändern (ohne Neu-Dekodieren)
+   - `scroll_preview_to_current()`: Hält das aktuelle Bild in der Vorschau sichtbar
+   - `populate_preview_table_lazy()`: Virtuelle Vorschauliste mit wiederverwendeten Zeilen-Widgets
+   - `update_preview_grid()`: Rasteransicht aus recycelten Canvas-Items (nur sichtbare Zellen)
+   - `update_preview_atlas()`: Rasteransicht als Atlas-Seiten (ein Canvas-Bild pro Zeilenband)
    - `toggle_folder_list()`: Schaltet Vorschauliste ein/aus
    - `open_image_in_system()` / `open_image_fs()`: Öffnet Bild im System
    - `copy_filename_fs()` / `copy_full_path_fs()`: Kopiert Dateinamen/Pfad
@@ -92,34 +116,66 @@ VERSION = "1.8.0.0"
 HISTORY_FILE = "ImagePromptViewer-History.json"
 
 import subprocess, sys, os, re, platform
-from datetime import datetime
+from datetime import datetime, timedelta
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 from tkinter.scrolledtext import ScrolledText
 import threading
 from pathlib import Path
-from collections import deque, OrderedDict
+from collections import deque, OrderedDict, Counter
 import time
 import json
+import hashlib
+import io
+import itertools
+import fnmatch
+import bisect
+import array
+import operator
+import math
+import queue
+import atexit
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:  # erst ab Python 3.8
+    shared_memory = None
+try:
+    import numpy
+except ImportError:  # optional: ohne NumPy werden die Stat-Spalten per Schleife ausgewertet
+    numpy = None
+try:
+    from re import _parser as sre_parse
+except ImportError:  # vor Python 3.11
+    import sre_parse
 
 # Globaler Parameter für den Skalierungsfaktor-Multiplikator
 SCALING_MULTIPLIER = 0.6
+# Backend für die Vorschaubild-Erzeugung: "thread" oder "process"
+THUMBNAIL_BACKEND = "thread"
+# Vorschaubildgröße in Pixeln; None = aus dem Skalierungsfaktor des Monitors ableiten
+THUMBNAIL_SIZE = None
 OPTIONS_FILE = "options_settings.json"
 
 def load_options_settings():
-    global SCALING_MULTIPLIER
+    global SCALING_MULTIPLIER, THUMBNAIL_BACKEND, THUMBNAIL_SIZE
     if os.path.exists(OPTIONS_FILE):
         try:
             with open(OPTIONS_FILE, "r", encoding="utf-8") as f:
                 data = json.load(f)
                 SCALING_MULTIPLIER = data.get("scaling_multiplier", 2.0)
+                THUMBNAIL_BACKEND = data.get("thumbnail_backend", "thread")
+                THUMBNAIL_SIZE = data.get("thumbnail_size")
         except Exception as e:
             print(f"Fehler beim Laden der Options: {e}")
     else:
         SCALING_MULTIPLIER = 2.0
 
 def save_options_settings():
-    data = {"scaling_multiplier": SCALING_MULTIPLIER}
+    data = {"scaling_multiplier": SCALING_MULTIPLIER, "thumbnail_backend": THUMBNAIL_BACKEND,
+            "thumbnail_size": THUMBNAIL_SIZE}
     try:
         with open(OPTIONS_FILE, "w", encoding="utf-8") as f:
             json.dump(data, f, indent=2)
@@ -136,6 +192,53 @@ def validate_index(index, items):
         return len(items) - 1 if items else -1
     return index
 
+class PositionIndex:
+    # Pfad -> Position für eine Bildliste (folder_images / filtered_images), ersetzt list.index().
+    # Angehängte Einträge (extend während des Ladens) werden beim nächsten Zugriff nachindiziert.
+    # Beim Löschen bleiben die gespeicherten Positionen stehen; die entfernten Positionen werden
+    # sortiert gemerkt und per bisect abgezogen. Erst nach COMPACT_AFTER Löschungen wird neu nummeriert.
+    COMPACT_AFTER = 1024
+
+    def __init__(self, items=None):
+        self.reset(items if items is not None else [])
+
+    def reset(self, items):
+        # Nach Neuaufbau oder Sortieren der Liste aufrufen
+        self.items = items
+        self.positions = {}
+        self.removed = []
+        self.indexed = 0
+
+    def _catch_up(self):
+        items = self.items
+        if self.indexed < len(items):
+            offset = len(self.removed)
+            positions = self.positions
+            for i in range(self.indexed, len(items)):
+                positions[items[i]] = i + offset
+            self.indexed = len(items)
+
+    def __contains__(self, file_path):
+        self._catch_up()
+        return file_path in self.positions
+
+    def index(self, file_path):
+        self._catch_up()
+        pos = self.positions.get(file_path)
+        if pos is None:
+            raise ValueError(f"{file_path} is not in list")
+        return pos - bisect.bisect_left(self.removed, pos) if self.removed else pos
+
+    def remove(self, file_path):
+        # Entfernt den Eintrag aus Liste und Index, gibt seine bisherige Position zurück
+        index = self.index(file_path)
+        del self.items[index]
+        bisect.insort(self.removed, self.positions.pop(file_path))
+        self.indexed -= 1
+        if len(self.removed) > self.COMPACT_AFTER:
+            self.reset(self.items)
+        return index
+
 try:
     from tkinterdnd2 import TkinterDnD, DND_FILES
 except ImportError:
@@ -143,10 +246,10 @@ except ImportError:
     from tkinterdnd2 import TkinterDnD, DND_FILES
 
 try:
-    from PIL import Image, ImageTk
+    from PIL import Image, ImageTk, ImageDraw, ImageFont
 except ImportError:
     subprocess.check_call([sys.executable, "-m", "pip", "install", "Pillow"])
-    from PIL import Image, ImageTk
+    from PIL import Image, ImageTk, ImageDraw, ImageFont
 
 try:
     from screeninfo import get_monitors
@@ -182,6 +285,29 @@ SCALE_OPTIONS = ["Default", "25%", "50%", "75%"]
 DEFAULT_SCALE = "Default"
 IMAGE_EXTENSIONS = (".png", ".PNG", ".jpg", ".JPG", ".jpeg", ".JPEG")
 
+# Persistenter Vorschaubild-Cache: Standardgrößen, Verzeichnis und Größenlimit
+THUMBNAIL_CACHE_DIR = "ImagePromptViewer-Thumbnails"
+THUMBNAIL_LEVELS = (64, 128, 256, 512)
+THUMBNAIL_CACHE_MAX_BYTES = 512 * 1024 * 1024
+# Hintergrund-Erzeugung der Vorschaubilder: Abfrageintervall für fertige Ergebnisse
+THUMBNAIL_POLL_MS = 40
+THUMBNAIL_PLACEHOLDER_COLOR = "#2A2A2A"
+# Virtuelle Vorschauliste: Zeilenabstand und zusätzliche Zeilen-Widgets über/unter dem Sichtbereich
+PREVIEW_ROW_PADDING = 3
+PREVIEW_OVERSCAN_ROWS = 3
+# Einstellbare Vorschaubildgröße in Pixeln (Liste und Raster)
+THUMBNAIL_SIZE_MIN = 48
+THUMBNAIL_SIZE_MAX = THUMBNAIL_LEVELS[-1]
+# Atlas-Seiten: so viele Rasterzeilen werden zu einem gemeinsamen Bild zusammengesetzt
+ATLAS_BAND_ROWS = 4
+
+# Zweiphasiges Rendern: schneller Vorschau-Resample, LANCZOS-Verfeinerung nach Ruhezeit
+RENDER_PREVIEW_RESAMPLE = Image.BILINEAR
+RENDER_FINAL_RESAMPLE = Image.LANCZOS
+REFINE_DELAY_MS = 150
+# Obergrenze des Frame-Caches in Bytes (Pixel x Kanäle)
+FRAME_CACHE_BYTES = 128 * 1024 * 1024
+
 def get_datetime_str():
     return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
@@ -204,17 +330,1500 @@ def load_image_with_cache(file_path, cache_dict, cache_limit):
         print(f"Fehler beim Laden von {file_path}: {e}")
         return None
 
+def load_reduced_image(file_path, target_size):
+    # Dekodiert nur so groß wie für target_size nötig: JPEG über draft() (libjpeg skaliert
+    # direkt mit 1/2, 1/4 oder 1/8), alle anderen Formate über reduce() vor dem Resample.
+    # Das Ergebnis ist immer mindestens so groß wie target_size.
+    target_w, target_h = max(1, int(target_size[0])), max(1, int(target_size[1]))
+    try:
+        img = Image.open(file_path)
+        if img.format == "JPEG":
+            img.draft(img.mode, (target_w, target_h))
+        factor = min(img.width // target_w, img.height // target_h)
+        if factor >= 2:
+            if img.mode not in ("L", "LA", "RGB", "RGBA", "CMYK", "I", "F"):
+                # reduce() kennt keine Paletten-/1-Bit-Bilder
+                img = img.convert("RGBA" if "transparency" in img.info else "RGB")
+            img = img.reduce(factor)
+        else:
+            img.load()
+        return img
+    except Exception as e:
+        print(f"Fehler beim Laden von {file_path}: {e}")
+        return None
+
+def load_thumbnail(file_path, size):
+    # Eigener Dekodierpfad für Vorschaubilder: thumbnail() nutzt draft() (JPEG) und
+    # reduce() mit reducing_gap, das volle Bild wird nie dekodiert oder gecacht.
+    try:
+        img = Image.open(file_path)
+        img.thumbnail((size, size), Image.LANCZOS, reducing_gap=2.0)
+        if img.mode not in ("RGB", "RGBA"):
+            img = img.convert("RGBA")
+        return img
+    except Exception as e:
+        print(f"Fehler beim Laden von {file_path}: {e}")
+        return None
+
+def load_exif_thumbnail(file_path, min_size):
+    # Eingebettetes EXIF-Vorschaubild (IFD1) eines JPEGs; piexif liest dafür nur die
+    # Segmente bis APP1. None, wenn keins vorhanden, zu klein oder mit abweichendem
+    # Seitenverhältnis (manche Kameras betten Vorschaubilder mit schwarzen Balken ein).
+    if not file_path.lower().endswith((".jpg", ".jpeg")):
+        return None
+    try:
+        data = piexif.load(file_path).get("thumbnail")
+        if not data:
+            return None
+        thumb = Image.open(io.BytesIO(data))
+        thumb.load()
+        if max(thumb.size) < min_size:
+            return None
+        with Image.open(file_path) as full:
+            full_w, full_h = full.size
+        if abs(thumb.width / thumb.height - full_w / full_h) > 0.05 * (full_w / full_h):
+            return None
+        if thumb.mode != "RGB":
+            thumb = thumb.convert("RGB")
+        if max(thumb.size) > min_size:
+            thumb.thumbnail((min_size, min_size), Image.LANCZOS)
+        return thumb
+    except Exception:
+        return None
+
+class ThumbnailCache:
+    # LRU für kleine, bereits dekodierte Vorschaubilder mit eigenem Speicherbudget.
+    # Schlüssel: (Pfad, Größe); unabhängig vom Bild-Cache der Hauptanzeige.
+    # Pro Datei eine Mip-Kette aus THUMBNAIL_LEVELS; andere Größen werden aus der
+    # nächstgrößeren vorhandenen Stufe verkleinert (je Datei höchstens eine abgeleitete Größe).
+    def __init__(self, byte_budget):
+        self.byte_budget = byte_budget
+        self.bytes_used = 0
+        self.entries = OrderedDict()
+        self.sizes_by_path = {}
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, file_path, size):
+        key = (file_path, size)
+        thumb = self.entries.get(key)
+        if thumb is not None:
+            self.entries.move_to_end(key)
+            return thumb
+        level = self.nearest_level(file_path, size)
+        if level is None:
+            return None
+        source = self.entries[(file_path, level)]
+        self.entries.move_to_end((file_path, level))
+        thumb = source.copy()
+        thumb.thumbnail((size, size), Image.LANCZOS)
+        for derived in [s for s in self.sizes_by_path[file_path] if s not in THUMBNAIL_LEVELS]:
+            self._drop((file_path, derived))
+        self.put(file_path, size, thumb)
+        return thumb
+
+    def covers(self, file_path, size):
+        # True, wenn get() ohne Dekodieren der Originaldatei liefern kann
+        return (file_path, size) in self.entries or self.nearest_level(file_path, size) is not None
+
+    def nearest_level(self, file_path, size):
+        sizes = self.sizes_by_path.get(file_path, ())
+        levels = [level for level in THUMBNAIL_LEVELS if level >= size and level in sizes]
+        return levels[0] if levels else None
+
+    def put(self, file_path, size, thumb):
+        key = (file_path, size)
+        self._drop(key)
+        self.entries[key] = thumb
+        self.sizes_by_path.setdefault(file_path, set()).add(size)
+        self.bytes_used += thumb.width * thumb.height * len(thumb.getbands())
+        while self.bytes_used > self.byte_budget and len(self.entries) > 1:
+            self._drop(next(iter(self.entries)))
+
+    def discard(self, file_path):
+        for size in self.sizes_by_path.pop(file_path, ()):
+            self._drop((file_path, size))
+
+    def clear(self):
+        self.entries.clear()
+        self.sizes_by_path.clear()
+        self.bytes_used = 0
+
+    def _drop(self, key):
+        thumb = self.entries.pop(key, None)
+        if thumb is None:
+            return
+        self.bytes_used -= thumb.width * thumb.height * len(thumb.getbands())
+        sizes = self.sizes_by_path.get(key[0])
+        if sizes is not None:
+            sizes.discard(key[1])
+            if not sizes:
+                del self.sizes_by_path[key[0]]
+
+def thumbnail_level(size):
+    # Kleinste Standardgröße, die mindestens so groß ist wie die angeforderte
+    for level in THUMBNAIL_LEVELS:
+        if level >= size:
+            return level
+    return THUMBNAIL_LEVELS[-1]
+
+class ThumbnailDiskCache:
+    # Vorschaubilder auf der Festplatte, verteilt auf Unterverzeichnisse (erste zwei Hex-Zeichen).
+    # Schlüssel: SHA1 aus Pfad, Stufe, mtime und Dateigröße - geänderte Dateien verfehlen
+    # den Cache automatisch. Treffer aktualisieren die mtime des Eintrags (LRU fürs Aufräumen).
+    def __init__(self, cache_dir, max_bytes):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.bytes_written = 0
+        self.lock = threading.Lock()
+        self.pruning = False
+
+    def entry_path(self, file_path, level):
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            return None
+        key = f"{os.path.normcase(os.path.abspath(file_path))}|{level}|{st.st_mtime_ns}|{st.st_size}"
+        digest = hashlib.sha1(key.encode("utf-8", "surrogatepass")).hexdigest()
+        return os.path.join(self.cache_dir, digest[:2], digest + ".jpg")
+
+    def get(self, file_path, level):
+        entry = self.entry_path(file_path, level)
+        if not entry or not os.path.exists(entry):
+            return None
+        try:
+            with Image.open(entry) as img:
+                img.load()
+            os.utime(entry)
+            return img
+        except Exception:
+            return None
+
+    def put(self, file_path, level, thumb):
+        entry = self.entry_path(file_path, level)
+        if not entry:
+            return
+        if thumb.mode != "RGB":
+            # Transparenz auf die Hintergrundfarbe der Vorschau legen, gespeichert wird JPEG
+            flat = Image.new("RGB", thumb.size, BG_COLOR)
+            flat.paste(thumb, (0, 0), thumb if thumb.mode == "RGBA" else None)
+            thumb = flat
+        tmp_path = f"{entry}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(entry), exist_ok=True)
+            thumb.save(tmp_path, "JPEG", quality=88)
+            os.replace(tmp_path, entry)
+            written = os.path.getsize(entry)
+        except Exception as e:
+            print(f"Fehler beim Speichern des Vorschaubilds für {file_path}: {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return
+        with self.lock:
+            self.bytes_written += written
+            start_prune = self.bytes_written > self.max_bytes // 10 and not self.pruning
+            if start_prune:
+                self.bytes_written = 0
+                self.pruning = True
+        if start_prune:
+            threading.Thread(target=self.prune, daemon=True).start()
+
+    def prune(self):
+        # Löscht die am längsten nicht benutzten Einträge, bis 90 % des Limits erreicht sind
+        with self.lock:
+            self.pruning = True
+        try:
+            entries = []
+            total = 0
+            if os.path.isdir(self.cache_dir):
+                for shard in os.scandir(self.cache_dir):
+                    if not shard.is_dir():
+                        continue
+                    for item in os.scandir(shard.path):
+                        try:
+                            st = item.stat()
+                        except OSError:
+                            continue
+                        entries.append((st.st_mtime, st.st_size, item.path))
+                        total += st.st_size
+            if total > self.max_bytes:
+                entries.sort()
+                target = int(self.max_bytes * 0.9)
+                for mtime, size, path in entries:
+                    if total <= target:
+                        break
+                    try:
+                        os.remove(path)
+                        total -= size
+                    except OSError:
+                        pass
+        finally:
+            with self.lock:
+                self.pruning = False
+
+def build_thumbnail_levels(file_path, size, disk_cache=None):
+    # Liefert {Stufe: Vorschaubild} für die Stufe von size, oder None. Liegt die Stufe auf der
+    # Festplatte, nur diese. Sonst wird aus dem eingebetteten EXIF-Vorschaubild (Stufen bis zur
+    # angeforderten) oder aus einer einzigen Dekodierung in der obersten Stufe die ganze Kette
+    # nach unten verkleinert und jede Stufe abgelegt - ein späterer Wechsel der Stufe liest dann
+    # nur noch den Festplatten-Cache. Threadsicher, greift nicht auf Tk oder den Speicher-Cache zu.
+    level = thumbnail_level(size)
+    cached = disk_cache.get(file_path, level) if disk_cache else None
+    if cached is not None:
+        return {level: cached}
+    source = load_exif_thumbnail(file_path, level)
+    top = level
+    if source is None:
+        top = THUMBNAIL_LEVELS[-1]
+        source = load_thumbnail(file_path, top)
+        if source is None:
+            return None
+    levels = {}
+    for chain_level in reversed(THUMBNAIL_LEVELS):
+        if chain_level > top:
+            continue
+        if max(source.size) > chain_level:
+            source = source.copy()
+            source.thumbnail((chain_level, chain_level), Image.LANCZOS)
+        levels[chain_level] = source
+        if disk_cache:
+            disk_cache.put(file_path, chain_level, source)
+    return levels
+
+class ThumbnailWorkerPool:
+    # Erzeugt Vorschaubilder in Hintergrund-Threads über build_thumbnail_levels().
+    # Aufträge laufen über eine Prioritätswarteschlange (0 = sichtbar, 1 = knapp außerhalb);
+    # stornierte oder höher priorisierte Einträge werden beim Abholen übersprungen.
+    # Fertige Ergebnisse ((Pfad, Stufe), {Stufe: Bild} oder None) holt der Tk-Thread gesammelt
+    # mit drain() ab. Geliefert werden die Stufen bis zur angeforderten; größere Stufen der Kette
+    # bleiben im Festplatten-Cache, damit sie das Speicherbudget nicht belegen.
+    def __init__(self, disk_cache, workers=None):
+        self.disk_cache = disk_cache
+        self.queue = queue.PriorityQueue()
+        self.pending = {}
+        self.results = deque()
+        self.lock = threading.Lock()
+        self.counter = itertools.count()
+        self.start_workers(workers or max(2, min(6, (os.cpu_count() or 4) - 1)))
+
+    def start_workers(self, worker_count):
+        for _ in range(worker_count):
+            threading.Thread(target=self._run, daemon=True).start()
+
+    def make_thumbnail(self, key):
+        levels = build_thumbnail_levels(key[0], key[1], self.disk_cache)
+        if levels is None:
+            return None
+        return {level: thumb for level, thumb in levels.items() if level <= key[1]}
+
+    def request(self, file_path, size, priority):
+        key = (file_path, size)
+        with self.lock:
+            current = self.pending.get(key)
+            if current is not None and current <= priority:
+                return
+            self.pending[key] = priority
+        self.queue.put((priority, next(self.counter), key))
+
+    def cancel_except(self, keep_keys):
+        with self.lock:
+            for key in [k for k in self.pending if k not in keep_keys]:
+                del self.pending[key]
+
+    def has_pending(self):
+        with self.lock:
+            return bool(self.pending or self.results)
+
+    def drain(self):
+        with self.lock:
+            items = list(self.results)
+            self.results.clear()
+        return items
+
+    def _run(self):
+        while True:
+            priority, _, key = self.queue.get()
+            with self.lock:
+                if self.pending.get(key) != priority:
+                    continue
+            levels = self.make_thumbnail(key)
+            with self.lock:
+                self.pending.pop(key, None)
+                self.results.append((key, levels))
+
+# Pro Worker-Prozess: angehängte Shared-Memory-Blöcke und eigener Festplatten-Cache
+_process_shared_blocks = {}
+_process_disk_cache = None
+
+def _attach_shared_memory(name):
+    # Die Worker teilen sich den resource_tracker mit dem Hauptprozess; freigegeben
+    # (unlink) werden die Blöcke nur dort in ThumbnailProcessPool.close()
+    block = _process_shared_blocks.get(name)
+    if block is None:
+        block = shared_memory.SharedMemory(name=name)
+        _process_shared_blocks[name] = block
+    return block
+
+def _thumbnail_process_job(file_path, size, block_name, cache_dir, cache_max_bytes):
+    # Läuft im Worker-Prozess: dekodieren, verkleinern und die rohen Pixel der Stufen bis zur
+    # angeforderten hintereinander in den Shared-Memory-Block schreiben (größere Stufen liegen
+    # schon im Festplatten-Cache); zurück geht nur [(Stufe, Breite, Höhe, Modus), ...].
+    global _process_disk_cache
+    disk_cache = None
+    if cache_dir:
+        if _process_disk_cache is None:
+            _process_disk_cache = ThumbnailDiskCache(cache_dir, cache_max_bytes)
+        disk_cache = _process_disk_cache
+    levels = build_thumbnail_levels(file_path, size, disk_cache)
+    if levels is None:
+        return None
+    block = _attach_shared_memory(block_name)
+    meta = []
+    offset = 0
+    for level, thumb in levels.items():
+        if level > size:
+            continue
+        if thumb.mode not in ("RGB", "RGBA"):
+            thumb = thumb.convert("RGBA")
+        data = thumb.tobytes()
+        block.buf[offset:offset + len(data)] = data
+        offset += len(data)
+        meta.append((level, thumb.width, thumb.height, thumb.mode))
+    return meta
+
+class ThumbnailProcessPool(ThumbnailWorkerPool):
+    # Wie ThumbnailWorkerPool, aber Dekodieren und Verkleinern laufen in Prozessen
+    # (umgeht den GIL). Pixel kommen über einen Ring wiederverwendeter Shared-Memory-
+    # Blöcke zurück, PIL-Objekte werden nie gepickelt. Jeder Dispatcher-Thread wartet
+    # auf genau einen Auftrag, es sind also höchstens so viele unterwegs wie Blöcke.
+    def start_workers(self, worker_count):
+        self.cache_dir = self.disk_cache.cache_dir if self.disk_cache else None
+        self.cache_max_bytes = self.disk_cache.max_bytes if self.disk_cache else 0
+        # spawn statt fork: geforkt wird sonst aus Dispatcher-Threads, während Tk und andere
+        # Threads Sperren halten können (z. B. die von print), das Kind kann dann hängen
+        self.executor = ProcessPoolExecutor(max_workers=worker_count,
+                                            mp_context=multiprocessing.get_context("spawn"))
+        block_size = sum(level * level * 4 for level in THUMBNAIL_LEVELS)
+        self.blocks = [shared_memory.SharedMemory(create=True, size=block_size)
+                       for _ in range(worker_count * 2)]
+        self.free_blocks = queue.Queue()
+        for block in self.blocks:
+            self.free_blocks.put(block)
+        self.closed = False
+        atexit.register(self.close)
+        for _ in range(len(self.blocks)):
+            threading.Thread(target=self._run, daemon=True).start()
+
+    def make_thumbnail(self, key):
+        block = self.free_blocks.get()
+        try:
+            meta = self.executor.submit(_thumbnail_process_job, key[0], key[1], block.name,
+                                        self.cache_dir, self.cache_max_bytes).result()
+            if meta is None:
+                return None
+            levels = {}
+            offset = 0
+            for level, width, height, mode in meta:
+                length = width * height * len(mode)
+                levels[level] = Image.frombytes(mode, (width, height), bytes(block.buf[offset:offset + length]))
+                offset += length
+            return levels
+        except Exception as e:
+            print(f"Fehler im Vorschaubild-Prozess für {key[0]}: {e}")
+            return None
+        finally:
+            self.free_blocks.put(block)
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+        except TypeError:  # cancel_futures erst ab Python 3.9
+            self.executor.shutdown(wait=False)
+        for block in self.blocks:
+            try:
+                block.close()
+                block.unlink()
+            except Exception:
+                pass
+
+def create_thumbnail_pool(backend, disk_cache, workers=None):
+    # Prozess-Backend nur, wenn Shared Memory verfügbar ist und der Pool startet
+    if backend == "process" and shared_memory is not None:
+        try:
+            return ThumbnailProcessPool(disk_cache, workers)
+        except Exception as e:
+            print(f"Prozess-Backend für Vorschaubilder nicht verfügbar, nutze Threads: {e}")
+    return ThumbnailWorkerPool(disk_cache, workers)
+
+def benchmark_thumbnail_backends(folder, size=128, limit=500):
+    # Vergleicht Thread- und Prozess-Backend beim Erzeugen von Vorschaubildern
+    # (ohne Festplatten-Cache, damit wirklich dekodiert wird).
+    # Aufruf: python ImagePromptViewer-<Version>.py --benchmark-thumbnails <Ordner> [Anzahl]
+    paths = [os.path.join(folder, f) for f in sorted(os.listdir(folder))
+             if f.lower().endswith(IMAGE_EXTENSIONS)][:limit]
+    if not paths:
+        print(f"No images found in {folder}")
+        return
+    print(f"Generating {len(paths)} thumbnails ({size}px), {os.cpu_count()} CPUs")
+    for backend in ("thread", "process"):
+        pool = create_thumbnail_pool(backend, None)
+        used = "process" if isinstance(pool, ThumbnailProcessPool) else "thread"
+        start = time.perf_counter()
+        for path in paths:
+            pool.request(path, size, 0)
+        done = 0
+        while done < len(paths):
+            done += len(pool.drain())
+            time.sleep(0.005)
+        elapsed = time.perf_counter() - start
+        print(f"{used:8s}: {elapsed:7.2f} s  {len(paths) / elapsed:8.1f} images/s")
+        if isinstance(pool, ThumbnailProcessPool):
+            pool.close()
+
+def get_cached_frame(cache_dict, key):
+    # Fertig gerenderte Frames, Schlüssel: (Pfad, (Breite, Höhe), Ausschnitt oder None, Resample-Filter)
+    frame = cache_dict.get(key)
+    if frame is not None:
+        cache_dict.move_to_end(key)
+    return frame
+
+def frame_bytes(frame):
+    return frame.width * frame.height * len(frame.getbands())
+
+def store_cached_frame(cache_dict, key, frame, byte_budget):
+    # LRU nach Bytes; ein einzelner Frame über dem Budget wird gar nicht gespeichert
+    if frame_bytes(frame) > byte_budget:
+        cache_dict.pop(key, None)
+        return
+    cache_dict[key] = frame
+    cache_dict.move_to_end(key)
+    total = sum(frame_bytes(cached) for cached in cache_dict.values())
+    while total > byte_budget:
+        _, evicted = cache_dict.popitem(last=False)
+        total -= frame_bytes(evicted)
+
+def frame_crop(size, visible):
+    # Größe des sichtbaren, zentrierten Ausschnitts eines Frames der Größe size, oder None,
+    # wenn der Frame ganz in visible (Breite, Höhe) passt - dann ist er flächenübergreifend gleich
+    width, height = size
+    if visible is None or (width <= visible[0] and height <= visible[1]):
+        return None
+    return min(width, visible[0]), min(height, visible[1])
+
+def render_frame(source, size, crop, resample):
+    # Skaliert source auf size. Mit crop (siehe frame_crop()) wird nur der sichtbare, zentrierte
+    # Ausschnitt berechnet (resize mit box), nie das ganze Zoom-Bild.
+    if crop is None:
+        return source.resize(size, resample)
+    width, height = size
+    out_w, out_h = crop
+    scale_x, scale_y = source.width / width, source.height / height
+    left, top = (width - out_w) / 2, (height - out_h) / 2
+    box = (left * scale_x, top * scale_y, (left + out_w) * scale_x, (top + out_h) * scale_y)
+    return source.resize((out_w, out_h), resample, box=box)
+
+def pad_thumbnail(thumb, cell_size):
+    # Zentriert ein Vorschaubild auf einer quadratischen Zelle in Hintergrundfarbe
+    if thumb.mode != "RGBA":
+        thumb = thumb.convert("RGBA")
+    cell = Image.new("RGB", (cell_size, cell_size), BG_COLOR)
+    cell.paste(thumb, ((cell_size - thumb.width) // 2, (cell_size - thumb.height) // 2), thumb)
+    return cell
+
+class PreviewGridCell:
+    # Recycelte Zelle der Rasteransicht: ein Bild- und ein Text-Item auf dem Vorschau-Canvas
+    __slots__ = ("slot", "index", "file_path", "image_id", "text_id", "thumb_loaded")
+
+    def __init__(self, slot):
+        self.slot = slot
+        self.index = -1
+        self.file_path = None
+        self.image_id = None
+        self.text_id = None
+        self.thumb_loaded = False
+
+class AtlasBand:
+    # Recycelte Atlas-Seite: ein Canvas-Bild für ATLAS_BAND_ROWS Rasterzeilen
+    __slots__ = ("slot", "band", "layout", "paths", "path_set", "item_id", "version", "pending")
+
+    def __init__(self, slot):
+        self.slot = slot
+        self.band = -1
+        self.layout = None
+        self.paths = []
+        self.path_set = frozenset()
+        self.item_id = None
+        self.version = 0
+        self.pending = False
+
+def shorten_caption(name, max_chars):
+    if len(name) > max_chars:
+        return name[:max_chars - 1] + "…"
+    return name
+
+def load_caption_font(size):
+    # Schrift für in Atlas-Seiten gezeichnete Beschriftungen; Fallback auf die PIL-Standardschrift
+    for font_name in ("arial.ttf", "DejaVuSans.ttf"):
+        try:
+            return ImageFont.truetype(font_name, size)
+        except OSError:
+            continue
+    return ImageFont.load_default()
+
+def compose_atlas_page(thumbs, names, columns, rows, thumb_size, cell_width, cell_height, font):
+    # Setzt eine Seite des Rasters (Bilder + Beschriftungen) zu einem einzigen Bild zusammen.
+    # Läuft im Hintergrund-Thread; fehlende Vorschaubilder werden als Platzhalter gezeichnet.
+    page = Image.new("RGB", (columns * cell_width, rows * cell_height), BG_COLOR)
+    draw = ImageDraw.Draw(page)
+    for i, (thumb, name) in enumerate(zip(thumbs, names)):
+        x = (i % columns) * cell_width + PREVIEW_ROW_PADDING
+        y = (i // columns) * cell_height + PREVIEW_ROW_PADDING
+        if thumb is None:
+            page.paste(THUMBNAIL_PLACEHOLDER_COLOR, (x, y, x + thumb_size, y + thumb_size))
+        else:
+            page.paste(pad_thumbnail(thumb, thumb_size), (x, y))
+        left, _, right, _ = draw.textbbox((0, 0), name, font=font)
+        draw.text((x + (thumb_size - (right - left)) // 2, y + thumb_size + 2), name,
+                  fill=TEXT_FG_COLOR, font=font)
+    return page
+
+def get_pooled_photo(pool, surface, image):
+    # Ein PhotoImage pro Anzeigefläche: neue Pixel werden per paste() übernommen,
+    # neu angelegt wird nur, wenn sich Größe oder Modus ändern.
+    entry = pool.get(surface)
+    if entry is not None and entry[1] == image.size and entry[2] == image.mode:
+        entry[0].paste(image)
+        return entry[0]
+    photo = ImageTk.PhotoImage(image)
+    pool[surface] = (photo, image.size, image.mode)
+    return photo
+
+def is_word_char(char):
+    return char.isalnum() or char == "_"
+
+class KeywordMatcher:
+    # Aho-Corasick-Automat über eine Schlüsselwortliste: ein Durchlauf pro Text liefert alle
+    # Treffer aller Schlüsselwörter (auch überlappende). Mit whole_word zählen nur Treffer,
+    # die wie bei \b...\b an Wortgrenzen beginnen und enden. Texte kleingeschrieben übergeben.
+    # Nur für das Highlighting (Positionen aller Treffer); für Ja/Nein-Prüfungen im Filter
+    # sind "in" und kompilierte Regexe (C-Code) deutlich schneller als diese Python-Schleife.
+    def __init__(self, keywords, whole_word=False):
+        self.keywords = tuple(keywords)
+        self.whole_word = whole_word
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [()]
+        for number, keyword in enumerate(self.keywords):
+            state = 0
+            for char in keyword:
+                next_state = self.goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self.goto)
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append(())
+                    self.goto[state][char] = next_state
+                state = next_state
+            if keyword:
+                self.output[state] += (number,)
+        # Fehlerübergänge in Breitensuche; Ausgaben der Fehlerzustände werden übernommen
+        pending = deque(self.goto[0].values())
+        while pending:
+            state = pending.popleft()
+            for char, next_state in self.goto[state].items():
+                pending.append(next_state)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[next_state] = self.goto[fallback].get(char, 0)
+                self.output[next_state] += self.output[self.fail[next_state]]
+
+    def find_all(self, text):
+        # Liefert (start, ende, nummer) aller Treffer in Textreihenfolge
+        goto, fail, output, keywords = self.goto, self.fail, self.output, self.keywords
+        hits = []
+        state = 0
+        for i, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for number in output[state]:
+                end = i + 1
+                start = end - len(keywords[number])
+                if self.whole_word and not self.at_word_boundaries(text, start, end):
+                    continue
+                hits.append((start, end, number))
+        return hits
+
+    def matched(self, text):
+        # Nummern aller Schlüsselwörter, die im Text vorkommen
+        return {number for _, _, number in self.find_all(text)}
+
+    @staticmethod
+    def at_word_boundaries(text, start, end):
+        before = start > 0 and is_word_char(text[start - 1])
+        after = end < len(text) and is_word_char(text[end])
+        return before != is_word_char(text[start]) and after != is_word_char(text[end - 1])
+
+_keyword_matchers = OrderedDict()
+_keyword_matchers_lock = threading.Lock()
+
+def get_keyword_matcher(keywords, whole_word):
+    # Automaten werden einmal pro Schlüsselwortliste gebaut und wiederverwendet (Filter-Thread und Tk-Thread)
+    key = (tuple(keywords), whole_word)
+    with _keyword_matchers_lock:
+        matcher = _keyword_matchers.get(key)
+        if matcher is not None:
+            _keyword_matchers.move_to_end(key)
+            return matcher
+    matcher = KeywordMatcher(*key)
+    with _keyword_matchers_lock:
+        _keyword_matchers[key] = matcher
+        while len(_keyword_matchers) > 32:
+            _keyword_matchers.popitem(last=False)
+    return matcher
+
 def match_keyword(text, keyword, whole_word):
     if whole_word:
-        return re.search(r'\b' + re.escape(keyword) + r'\b', text) is not None
+        # "in" (C-Schleife) sortiert die meisten Texte aus, bevor die Regex läuft
+        return keyword in text and re.search(r'\b' + re.escape(keyword) + r'\b', text) is not None
     else:
         return keyword in text
 
-def extract_text_chunks(img_path):
+TOKEN_PATTERN = re.compile(r"\w+")
+INDEX_FIELDS = ("prompt", "negativ", "settings", "filename")
+# Unscharfe Suche (prompt~wort): Mindest-Ähnlichkeit (Jaccard über Trigramme)
+FUZZY_SIMILARITY = 0.5
+
+def trigram_text(text):
+    # Kleingeschrieben, jede Folge von Nicht-Wort-Zeichen wird ein Leerzeichen
+    return " ".join(TOKEN_PATTERN.findall(text.lower()))
+
+def trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+def fuzzy_similarity(keyword, text):
+    # Beste Ähnlichkeit zwischen keyword und einem gleich langen Wortfenster aus text (beide
+    # über trigram_text() normalisiert, Wörter mit Leerzeichen gepolstert wie bei pg_trgm)
+    grams = trigrams(f" {keyword} ")
+    width = len(keyword.split())
+    tokens = text.split()
+    best = 0.0
+    for i in range(len(tokens) - width + 1):
+        other = trigrams(" " + " ".join(tokens[i:i + width]) + " ")
+        shared = len(grams & other)
+        best = max(best, shared / (len(grams) + len(other) - shared))
+    return best
+
+class TrigramIndex:
+    # Trigramm-Index über den Prompt (trigram_text(), an den Rändern gepolstert) für Infix- und
+    # unscharfe Suche. Posting-Listen sind array("I") mit aufsteigenden Dokument-IDs, da IDs nur
+    # angehängt werden. Gelöschte IDs bleiben stehen, bis mehr als die Hälfte tot ist.
+    def __init__(self):
+        self.postings = {}
+        self.size = 0
+        self.dead = 0
+
+    def add(self, doc_id, text):
+        for gram in trigrams(f" {trigram_text(text)} "):
+            postings = self.postings.get(gram)
+            if postings is None:
+                postings = self.postings[gram] = array.array("I")
+            postings.append(doc_id)
+        self.size += 1
+
+    def discard(self, live_ids):
+        self.dead += 1
+        if self.dead * 2 > self.size:
+            for gram, postings in list(self.postings.items()):
+                postings = array.array("I", (doc_id for doc_id in postings if doc_id in live_ids))
+                if postings:
+                    self.postings[gram] = postings
+                else:
+                    del self.postings[gram]
+            self.size -= self.dead
+            self.dead = 0
+
+    def infix(self, keyword):
+        # Obermenge der Dokumente, deren Prompt keyword enthält (Schnitt der Posting-Listen,
+        # kürzeste zuerst); None, wenn keyword kein Trigramm hat
+        grams = trigrams(trigram_text(keyword))
+        if not grams:
+            return None
+        lists = sorted((self.postings.get(gram, ()) for gram in grams), key=len)
+        result = set(lists[0])
+        for postings in lists[1:]:
+            if not result:
+                break
+            result.intersection_update(postings)
+        return result
+
+    def scan_count(self, grams, minimum):
+        # Dokumente mit mindestens minimum der gegebenen Trigramme
+        counts = Counter(itertools.chain.from_iterable(self.postings.get(gram, ()) for gram in grams))
+        return [doc_id for doc_id, count in counts.items() if count >= minimum]
+
+class TokenIndex:
+    # Invertierter Index über Prompt, Negativ-Prompt, Settings und Dateiname.
+    # Jede Datei bekommt eine Dokument-ID (doc_ids / doc_paths); pro Feld zeigt jedes Token
+    # (\w+, kleingeschrieben) auf die Menge der IDs, die es enthalten. Ein Schlüsselwort aus
+    # genau einem Token wird allein über die Posting-Mengen beantwortet, alle anderen werden
+    # nur an den so vorausgewählten Kandidaten mit match_keyword() nachgeprüft.
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.doc_ids = {}
+        self.doc_paths = []
+        self.doc_texts = []
+        self.live_ids = set()
+        self.postings = {field: {} for field in INDEX_FIELDS}
+        self.doc_params = {}
+        self.doc_loras = {}
+        self.trigrams = TrigramIndex()
+
+    def __contains__(self, file_path):
+        return file_path in self.doc_ids
+
+    def __len__(self):
+        return len(self.live_ids)
+
+    def add(self, file_path, prompt, negativ, settings):
+        if file_path in self.doc_ids:
+            self.remove(file_path)
+        doc_id = len(self.doc_paths)
+        texts = (prompt, negativ, settings, os.path.basename(file_path))
+        self.doc_ids[file_path] = doc_id
+        self.doc_paths.append(file_path)
+        self.doc_texts.append(texts)
+        self.live_ids.add(doc_id)
+        for field, text in zip(INDEX_FIELDS, texts):
+            postings = self.postings[field]
+            for token in set(TOKEN_PATTERN.findall(text.lower())):
+                postings.setdefault(token, set()).add(doc_id)
+        self.trigrams.add(doc_id, prompt)
+        return doc_id
+
+    def remove(self, file_path):
+        # Die ID wird nicht wiederverwendet, damit spätere Tabellen (nach ID) gültig bleiben
+        doc_id = self.doc_ids.pop(file_path, None)
+        if doc_id is None:
+            return
+        for field, text in zip(INDEX_FIELDS, self.doc_texts[doc_id]):
+            postings = self.postings[field]
+            for token in set(TOKEN_PATTERN.findall(text.lower())):
+                ids = postings.get(token)
+                if ids is not None:
+                    ids.discard(doc_id)
+                    if not ids:
+                        del postings[token]
+        self.doc_paths[doc_id] = None
+        self.doc_texts[doc_id] = None
+        self.doc_params.pop(doc_id, None)
+        self.doc_loras.pop(doc_id, None)
+        self.live_ids.discard(doc_id)
+        self.trigrams.discard(self.live_ids)
+
+    def text(self, field, doc_id):
+        return self.doc_texts[doc_id][INDEX_FIELDS.index(field)].lower()
+
+    def params(self, doc_id):
+        # Settings-Parameter werden erst bei Bedarf geparst und pro Dokument gemerkt
+        if doc_id is None or self.doc_texts[doc_id] is None:
+            return {}
+        params = self.doc_params.get(doc_id)
+        if params is None:
+            params = self.doc_params[doc_id] = parse_settings_params(self.doc_texts[doc_id][2])
+        return params
+
+    def loras(self, doc_id):
+        if doc_id is None or self.doc_texts[doc_id] is None:
+            return ()
+        loras = self.doc_loras.get(doc_id)
+        if loras is None:
+            loras = self.doc_loras[doc_id] = tuple(name.strip() for name in LORA_PATTERN.findall(self.doc_texts[doc_id][0].lower()))
+        return loras
+
+    def candidates(self, field, keyword, whole_word):
+        # Liefert (IDs, exakt). IDs ist eine Obermenge der Treffer oder None (keine Einschränkung).
+        # Ohne "Whole Word" darf das erste Token links und das letzte rechts über das
+        # Schlüsselwort hinausragen; dafür wird das (kleine) Vokabular durchsucht.
+        if field == "prompt" and not whole_word:
+            # Infix über den Trigramm-Index statt über das Vokabular; Treffer werden nachgeprüft
+            ids = self.trigrams.infix(keyword)
+            if ids is not None:
+                return ids & self.live_ids, False
+        postings = self.postings[field]
+        tokens = list(TOKEN_PATTERN.finditer(keyword))
+        if not tokens:
+            return None, False
+        result = None
+        for match in tokens:
+            token = match.group()
+            left_open = not whole_word and match.start() == 0
+            right_open = not whole_word and match.end() == len(keyword)
+            if left_open and right_open:
+                ids = set().union(*(p for t, p in postings.items() if token in t))
+            elif left_open:
+                ids = set().union(*(p for t, p in postings.items() if t.endswith(token)))
+            elif right_open:
+                ids = set().union(*(p for t, p in postings.items() if t.startswith(token)))
+            else:
+                ids = postings.get(token, set())
+            result = ids if result is None else result & ids
+            if not result:
+                break
+        exact = len(tokens) == 1 and tokens[0].group() == keyword
+        return result, exact
+
+    def matches_each(self, field, keywords, whole_word):
+        # Treffermenge je Schlüsselwort (gleiche Reihenfolge wie keywords); nachgeprüft wird
+        # jedes Schlüsselwort nur an seinen eigenen Kandidaten
+        results = []
+        for keyword in keywords:
+            ids, exact = self.candidates(field, keyword, whole_word)
+            if not exact:
+                if ids is None:
+                    ids = self.live_ids
+                ids = {doc_id for doc_id in ids if match_keyword(self.text(field, doc_id), keyword, whole_word)}
+            results.append(ids)
+        return results
+
+    def matches(self, field, keyword, whole_word):
+        return self.matches_each(field, (keyword,), whole_word)[0]
+
+    def fuzzy(self, keyword):
+        # {Dokument-ID: Ähnlichkeit} aller Prompts mit einem Wortfenster ähnlich zu keyword.
+        # Jaccard >= s verlangt mindestens s * |Trigramme(keyword)| gemeinsame Trigramme,
+        # daher genügt ScanCount über die Posting-Listen als Vorauswahl.
+        grams = trigrams(f" {keyword} ")
+        if not keyword or not grams:
+            return {}
+        scores = {}
+        for doc_id in self.trigrams.scan_count(grams, math.ceil(FUZZY_SIMILARITY * len(grams))):
+            if doc_id in self.live_ids:
+                score = fuzzy_similarity(keyword, trigram_text(self.doc_texts[doc_id][0]))
+                if score >= FUZZY_SIMILARITY:
+                    scores[doc_id] = score
+        return scores
+
+    def matches_any(self, field, keywords, whole_word):
+        return set().union(*self.matches_each(field, keywords, whole_word))
+
+STAT_COLUMNS = ("size", "ctime", "mtime")
+# "in" / "out": Schwelle ist ein Bereich [Anfang, Ende) - mit & und | auch für NumPy-Spalten
+STAT_OPERATORS = {">": operator.gt, ">=": operator.ge, "<": operator.lt, "<=": operator.le,
+                  "=": operator.eq, "!=": operator.ne,
+                  "in": lambda actual, bounds: (actual >= bounds[0]) & (actual < bounds[1]),
+                  "out": lambda actual, bounds: (actual < bounds[0]) | (actual >= bounds[1])}
+# Alter = Anfragezeit - Zeitstempel: "age<7d" entspricht "ctime > Anfragezeit - 7d"
+FLIPPED_OPERATORS = {">": "<", ">=": "<=", "<": ">", "<=": ">=", "=": "=", "!=": "!="}
+
+def date_comparison(op, day):
+    # Ein Datum steht für den ganzen Tag [Tagesbeginn, Beginn des Folgetags):
+    # "date:X" liegt im Bereich, "date<=X" vor dessen Ende, "date>X" ab dessen Ende
+    start, end = day
+    if op == "=":
+        return "in", day
+    if op == "!=":
+        return "out", day
+    if op == "<=":
+        return "<", end
+    if op == ">":
+        return ">=", end
+    return op, start
+
+def stat_term_column(term):
+    # (Spalte, Operator, Schwelle) für einen Größen- oder Datumsterm
+    _, kind, _, op, value, _ = term
+    if kind == "size":
+        return "size", op, value
+    if kind in ("age", "modified"):
+        seconds, minute = value
+        return "ctime" if kind == "age" else "mtime", FLIPPED_OPERATORS[op], minute * 60 - seconds
+    return ("ctime",) + date_comparison(op, value)
+
+class StatColumns:
+    # Größe, ctime und mtime aller gescannten Dateien als Spalten (array "d"), gefüllt einmal
+    # beim Ordner-Scan. rows bildet Pfad -> Zeile ab; gelöschte Dateien werden nur in valid
+    # ausgetragen, damit Sortieren und Löschen die Zeilen nicht verschieben. Größen- und
+    # Datumsklauseln werden über alle Zeilen auf einmal zu einer Maske ausgewertet - mit
+    # NumPy vektorisiert, sonst in einer Schleife ohne Systemaufrufe. paths bildet Zeile -> Pfad
+    # ab, damit select() die Treffer direkt aus der Maske liest statt jede Datei einzeln zu prüfen.
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        with self.lock:
+            self.rows = {}
+            self.paths = []
+            self.columns = {name: array.array("d") for name in STAT_COLUMNS}
+            self.valid = bytearray()
+
+    def add(self, file_path, stat_result):
+        values = (stat_result.st_size, stat_result.st_ctime, stat_result.st_mtime)
+        with self.lock:
+            row = self.rows.get(file_path)
+            if row is None:
+                self.rows[file_path] = len(self.valid)
+                self.paths.append(file_path)
+                for name, value in zip(STAT_COLUMNS, values):
+                    self.columns[name].append(value)
+                self.valid.append(1)
+            else:
+                for name, value in zip(STAT_COLUMNS, values):
+                    self.columns[name][row] = value
+                self.valid[row] = 1
+
+    def remove(self, file_path):
+        with self.lock:
+            row = self.rows.pop(file_path, None)
+            if row is not None:
+                self.valid[row] = 0
+
+    def mask(self, clauses):
+        # mask[row] ist wahr, wenn die Zeile alle Klauseln (nur STAT_TERM_KINDS) erfüllt.
+        # Zeilen, die erst danach hinzukommen, liegen außerhalb der Maske.
+        tests = [[(term[0],) + stat_term_column(term) for term in clause] for clause in clauses]
+        with self.lock:
+            if numpy is not None:
+                columns = {name: numpy.array(self.columns[name], dtype=numpy.float64) for name in STAT_COLUMNS}
+                mask = numpy.frombuffer(self.valid, dtype=numpy.uint8).astype(bool)
+            else:
+                columns = {name: self.columns[name][:] for name in STAT_COLUMNS}
+                mask = bytearray(self.valid)
+        if numpy is not None:
+            for clause in tests:
+                clause_mask = numpy.zeros(len(mask), dtype=bool)
+                for negate, name, op, threshold in clause:
+                    term_mask = STAT_OPERATORS[op](columns[name], threshold)
+                    clause_mask |= ~term_mask if negate else term_mask
+                mask &= clause_mask
+            return mask
+        for row in range(len(mask)):
+            if mask[row] and not all(any(STAT_OPERATORS[op](columns[name][row], threshold) != negate
+                                         for negate, name, op, threshold in clause) for clause in tests):
+                mask[row] = 0
+        return mask
+
+    def select(self, clauses, candidates, fallback):
+        # Kandidaten (Reihenfolge bleibt), die alle Klauseln erfüllen. Treffer kommen aus der Maske
+        # (flatnonzero bzw. compress über die Zeilen). Der Ordner-Scan trägt jede Datei ein, bevor
+        # sie in die Bildliste kommt; nur Kandidaten ganz ohne Zeile prüft fallback(Pfad) einzeln.
+        mask = self.mask(clauses)
+        with self.lock:
+            paths = self.paths[:len(mask)]
+        if numpy is not None:
+            passed = {paths[row] for row in numpy.flatnonzero(mask).tolist()}
+        else:
+            passed = set(itertools.compress(paths, mask))
+        unmasked = {file_path for file_path in itertools.filterfalse(self.rows.__contains__, candidates)
+                    if fallback(file_path)}
+        if unmasked:
+            passed |= unmasked
+        return [file_path for file_path in candidates if file_path in passed]
+
+# Filterauswertung im Hintergrund: so viele Dateien pro Zwischenmeldung an den Tk-Thread
+FILTER_BATCH_SIZE = 500
+# Suche beim Tippen: Wartezeit nach dem letzten Tastendruck, bevor ausgewertet wird
+LIVE_FILTER_DELAY_MS = 120
+
+def parse_int_or_none(text):
+    try:
+        return int(text) if text else None
+    except ValueError:
+        return None
+
+# Anzahl zwischengespeicherter Filterergebnisse (Hin- und Herschalten kostet dann nichts)
+FILTER_RESULT_CACHE_SIZE = 8
+
+# Abfragesprache des Filterfelds, z. B.
+#   prompt:"red dress" -neg:blurry steps>=30 sampler:"DPM++ 2M" size<2MB age<7d lora:detail*
+# Leerzeichen trennen Terme (UND), "OR" verbindet benachbarte Terme, "-" verneint einen Term.
+# Eine Anfrage wird zu einer frozenset von Klauseln (UND), jede Klausel ist eine frozenset von
+# Termen (ODER). Mehr Klauseln = engere Anfrage: so lässt sich Einengen/Erweitern per
+# Teilmengen-Vergleich erkennen. Term: (negiert, Art, Feld, Operator, Wert, whole_word) mit Art
+#   "text"   Feld aus INDEX_FIELDS, Wert = Schlüsselwort (Auswertung über den Token-Index)
+#   "fuzzy"  prompt~wort: Wert = Schlüsselwort, tippfehlertolerant über den Trigramm-Index
+#   "regex"  prompt:/muster/ (ohne Feld: Prompt), Wert = Muster, Auswertung im Regex-Prozess
+#   "lora"   Wert = Lora-Name, * als Platzhalter
+#   "param"  Feld = Settings-Parameter (steps, sampler, cfgscale, seed, model, ...)
+#   "size"   Wert = Bytes;  "date"  Wert = (Tagesbeginn, Beginn des Folgetags) als Zeitstempel (ctime)
+#   "age" / "modified"  Wert = (Sekunden, Minute der Anfrage), Alter nach ctime bzw. mtime
+QUERY_TERM_PATTERN = re.compile(r'(-)?(?:([A-Za-z_]+)(>=|<=|!=|:|=|>|<|~)(?!=))?("[^"]*"?|/(?:\\.|[^/\\])*/|[^\s"]+)')
+QUERY_TEXT_FIELDS = {"prompt": "prompt", "neg": "negativ", "negative": "negativ",
+                     "settings": "settings", "file": "filename", "filename": "filename"}
+QUERY_PARAM_ALIASES = {"cfg": "cfgscale", "checkpoint": "model", "scheduler": "scheduletype"}
+QUERY_SIZE_UNITS = {"": 1024, "b": 1, "kb": 1024, "mb": 1024 ** 2, "gb": 1024 ** 3}
+QUERY_AGE_UNITS = {"": 86400, "m": 60, "h": 3600, "d": 86400, "w": 7 * 86400, "y": 365 * 86400}
+# Eingaben ohne diese Merkmale gelten als klassische, kommagetrennte Keyword-Liste (siehe is_filter_query()).
+# Feldnamen in beliebiger Schreibweise, aber nur mit direkt folgendem Wert: "Seed: 12345" und
+# "seed: 12345" bleiben Keywords (Suche in den Settings), "seed:12345" ist eine Abfrage.
+QUERY_SYNTAX_PATTERN = re.compile(r'(^|\s)-\S|"|(^|[\s:])/.*/|\bOR\b|(?i:\b(prompt|neg|negative|settings|file|filename|lora|size|age|'
+                                  r'modified|date|steps|sampler|cfg|seed|model)(>=|<=|!=|[:<>=~])[^\s,=])|\w(>=|<=|>|<)[^\s,=]')
+# Feld mit Operator, aber ohne Wert (z. B. "steps:" vor einem Leerzeichen)
+QUERY_MISSING_VALUE_PATTERN = re.compile(r'[A-Za-z_]+(>=|<=|!=|:|=|>|<|~)')
+# Zitate und /Muster/ dürfen Kommas enthalten, ohne dass die Eingabe als Komma-Liste gilt
+QUERY_QUOTED_PATTERN = re.compile(r'"[^"]*"?|/(?:\\.|[^/\\])*/')
+# Planer: geschätzte Kosten je Term. Datum (ctime aus dem Scan) und Größe (ein stat) und der
+# Dateiname brauchen keine Metadaten; ab FILTER_METADATA_COST muss die Datei indiziert sein.
+FILTER_TERM_COSTS = {"age": 1, "date": 1, "size": 2, "modified": 2, "filename": 3, "text": 5, "fuzzy": 5,
+                     "lora": 6, "param": 6, "regex": 7}
+FILTER_METADATA_COST = 5
+# Terme, die allein aus den Stat-Spalten beantwortet werden können
+STAT_TERM_KINDS = ("size", "age", "modified", "date")
+SETTINGS_PARAM_PATTERN = re.compile(r'([A-Za-z][A-Za-z0-9 _\-/]*?):\s*("[^"]*"|[^,]*)')
+LORA_PATTERN = re.compile(r"<lora:([^:>]+)")
+
+class FilterQueryError(ValueError):
+    pass
+
+def normalize_param_key(key):
+    key = re.sub(r"[\s_\-]", "", key.lower())
+    return QUERY_PARAM_ALIASES.get(key, key)
+
+def parse_settings_params(settings):
+    # "Steps: 30, Sampler: DPM++ 2M, CFG scale: 7" -> {"steps": "30", "sampler": "dpm++ 2m", "cfgscale": "7"}
+    params = {}
+    for key, value in SETTINGS_PARAM_PATTERN.findall(settings):
+        params.setdefault(normalize_param_key(key), value.strip().strip('"').lower())
+    return params
+
+def parse_quantity(value, units, field):
+    match = re.fullmatch(r"(\d+(?:\.\d+)?)\s*([a-z]*)", value.lower())
+    if not match or match.group(2) not in units:
+        raise FilterQueryError(f"Invalid value for {field}: {value}")
+    return float(match.group(1)) * units[match.group(2)]
+
+def build_query_term(negate, field, op, value, whole_word, minute):
+    if field is None:
+        return (negate, "text", "prompt", ":", value.lower(), whole_word)
+    name = field.lower()
+    if op == "~":
+        if QUERY_TEXT_FIELDS.get(name) != "prompt":
+            raise FilterQueryError("'~' (typo-tolerant) is only supported for prompt")
+        return (negate, "fuzzy", "prompt", op, trigram_text(value), False)
+    if name in QUERY_TEXT_FIELDS:
+        if op != ":":
+            raise FilterQueryError(f"{field} only supports ':'")
+        return (negate, "text", QUERY_TEXT_FIELDS[name], ":", value.lower(), whole_word)
+    op = "=" if op == ":" else op
+    if name == "lora":
+        if op != "=":
+            raise FilterQueryError("lora only supports ':'")
+        return (negate, "lora", None, op, value.lower(), False)
+    if name == "size":
+        return (negate, "size", None, op, parse_quantity(value, QUERY_SIZE_UNITS, field), False)
+    if name in ("age", "modified"):
+        return (negate, name, None, op, (parse_quantity(value, QUERY_AGE_UNITS, field), minute), False)
+    if name == "date":
+        try:
+            day = datetime.strptime(value, "%Y-%m-%d")
+            return (negate, "date", None, op, (day.timestamp(), (day + timedelta(days=1)).timestamp()), False)
+        except ValueError:
+            raise FilterQueryError(f"Invalid date: {value} (expected YYYY-MM-DD)")
+    return (negate, "param", normalize_param_key(field), op, value.lower(), False)
+
+def build_regex_term(negate, field, op, pattern):
+    field = QUERY_TEXT_FIELDS.get((field or "prompt").lower())
+    if field is None or op not in (None, ":"):
+        raise FilterQueryError("Regex patterns need a text field: prompt:/.../, neg:/.../, settings:/.../, file:/.../")
+    try:
+        get_compiled_regex(pattern)
+    except re.error as e:
+        raise FilterQueryError(f"Invalid regex /{pattern}/: {e}")
+    return (negate, "regex", field, ":", pattern, False)
+
+def parse_filter_query(text, whole_word=False, now_ts=None):
+    # Übersetzt eine Abfrage in Klauseln (siehe oben); Fehler als FilterQueryError
+    minute = int((datetime.now().timestamp() if now_ts is None else now_ts) // 60)
+    groups = []
+    join_next = False
+    pos = 0
+    while pos < len(text):
+        if text[pos].isspace():
+            pos += 1
+            continue
+        match = QUERY_TERM_PATTERN.match(text, pos)
+        if not match:
+            raise FilterQueryError(f"Cannot parse query at: {text[pos:pos + 20]}")
+        pos = match.end()
+        negate, field, op, raw = match.groups()
+        if not field and QUERY_MISSING_VALUE_PATTERN.fullmatch(raw):
+            raise FilterQueryError(f"Missing value after {raw}")
+        if not negate and not field and raw == "OR":
+            if not groups or join_next:
+                raise FilterQueryError("OR needs a term on both sides")
+            join_next = True
+            continue
+        if len(raw) > 2 and raw[0] == raw[-1] == "/":
+            term = build_regex_term(bool(negate), field, op, raw[1:-1])
+        else:
+            value = raw.strip('"')
+            if not value and field:
+                raise FilterQueryError(f"Missing value after {field}{op}")
+            if not value:
+                continue
+            term = build_query_term(bool(negate), field, op, value, whole_word, minute)
+        if join_next:
+            groups[-1].append(term)
+        else:
+            groups.append([term])
+        join_next = False
+    if join_next:
+        raise FilterQueryError("OR needs a term on both sides")
+    return frozenset(frozenset(group) for group in groups)
+
+def is_filter_query(filter_text):
+    # Abfragesprache nur ohne Komma außerhalb von Zitaten und Mustern: "masterpiece, <lora:detail"
+    # bleibt eine klassische Keyword-Liste, obwohl "lora:" darin vorkommt
+    if "," in QUERY_QUOTED_PATTERN.sub("", filter_text):
+        return False
+    return bool(QUERY_SYNTAX_PATTERN.search(filter_text))
+
+def query_highlight_keywords(filter_text):
+    # Hervorzuhebende Keywords: nicht verneinte Textterme der Abfrage bzw. die Komma-Liste
+    if is_filter_query(filter_text):
+        try:
+            clauses = parse_filter_query(filter_text)
+        except FilterQueryError:
+            return []
+        return sorted({term[4] for clause in clauses for term in clause if term[1] == "text" and not term[0]})
+    return [k.strip().lower() for k in filter_text.split(",") if k.strip()]
+
+# Regex-Filter: Muster werden je Prozess einmal kompiliert (LRU). Ausgewertet wird in einem
+# eigenen Prozess in Blöcken; braucht ein Block länger als REGEX_CHUNK_BUDGET Sekunden
+# (z. B. katastrophales Backtracking), gilt das Muster als zu teuer.
+REGEX_CACHE_SIZE = 32
+REGEX_CHUNK_SIZE = 2000
+REGEX_CHUNK_BUDGET = 2.0
+# Wie oft ein laufender Regex-Auftrag prüft, ob sein Filterlauf noch aktuell ist (Sekunden)
+REGEX_POLL_INTERVAL = 0.05
+_compiled_regexes = OrderedDict()
+_compiled_regexes_lock = threading.Lock()
+
+def get_compiled_regex(pattern):
+    # Groß-/Kleinschreibung egal wie im übrigen Filter (die Texte kommen kleingeschrieben)
+    with _compiled_regexes_lock:
+        compiled = _compiled_regexes.get(pattern)
+        if compiled is not None:
+            _compiled_regexes.move_to_end(pattern)
+            return compiled
+    compiled = re.compile(pattern, re.IGNORECASE)
+    with _compiled_regexes_lock:
+        _compiled_regexes[pattern] = compiled
+        while len(_compiled_regexes) > REGEX_CACHE_SIZE:
+            _compiled_regexes.popitem(last=False)
+    return compiled
+
+def regex_literals(pattern):
+    # Zeichenfolgen, die in jedem Treffer des Musters vorkommen müssen (zusammenhängende
+    # Literale auf oberster Ebene, in Gruppen und in Wiederholungen mit Minimum >= 1)
+    try:
+        parsed = sre_parse.parse(pattern, re.IGNORECASE)
+    except Exception:
+        return []
+    literals = []
+    current = []
+
+    def flush():
+        if current:
+            literals.append("".join(current).lower())
+            current.clear()
+
+    def walk(items):
+        for op, av in items:
+            if op is sre_parse.LITERAL:
+                current.append(chr(av))
+            elif op is sre_parse.SUBPATTERN:
+                walk(av[-1])
+            elif op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT) and av[0] >= 1:
+                flush()
+                walk(av[2])
+                flush()
+            else:
+                flush()
+    walk(parsed)
+    flush()
+    return literals
+
+def _regex_process_job(pattern, texts):
+    # Läuft im Regex-Prozess: Positionen der Texte, in denen das Muster vorkommt
+    compiled = get_compiled_regex(pattern)
+    return [i for i, text in enumerate(texts) if compiled.search(text)]
+
+class RegexTooExpensive(Exception):
+    pass
+
+class RegexProcess:
+    # Ein Hilfsprozess für Regex-Suchen. Ein laufendes re.search lässt sich nicht abbrechen,
+    # ein Prozess schon: bei Zeitüberschreitung wird er beendet und beim nächsten Aufruf neu gestartet.
+    def __init__(self):
+        self.pool = None
+        self.lock = threading.Lock()
+        atexit.register(self.close)
+
+    def search(self, pattern, texts, budget, is_current=lambda: True):
+        # Aufträge laufen nacheinander (die Sperre wird bis zum Ergebnis gehalten), daher trifft
+        # ein Abbruch oder eine Zeitüberschreitung nur den eigenen Auftrag. budget zählt ab dem
+        # Start des Auftrags; der Prozessstart (spawn importiert dieses Modul neu) wird vorher mit
+        # einem leeren Auftrag abgewartet. Liefert None, sobald is_current() False ist - der noch
+        # laufende Auftrag wird dann mit dem Prozess beendet, statt den nächsten Lauf zu blockieren.
+        with self.lock:
+            if not is_current():
+                return None
+            if self.pool is None:
+                pool = multiprocessing.get_context("spawn").Pool(processes=1)
+                pool.apply(_regex_process_job, ("", []))
+                self.pool = pool
+            job = self.pool.apply_async(_regex_process_job, (pattern, texts))
+            deadline = time.monotonic() + budget
+            while not job.ready():
+                if not is_current():
+                    self.close()
+                    return None
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.close()
+                    raise RegexTooExpensive(pattern)
+                job.wait(min(REGEX_POLL_INTERVAL, remaining))
+            return job.get()
+
+    def close(self):
+        pool, self.pool = self.pool, None
+        if pool is not None:
+            pool.terminate()
+
+def compare_query_value(actual, op, expected):
+    if op in ("=", "!="):
+        if isinstance(expected, str) and "*" in expected:
+            result = fnmatch.fnmatchcase(str(actual), expected)
+        else:
+            try:
+                result = float(actual) == float(expected)
+            except (TypeError, ValueError):
+                result = str(actual) == str(expected)
+        return result if op == "=" else not result
+    try:
+        actual, expected = float(actual), float(expected)
+    except (TypeError, ValueError):
+        return False
+    if op == ">":
+        return actual > expected
+    if op == ">=":
+        return actual >= expected
+    if op == "<":
+        return actual < expected
+    return actual <= expected
+
+def file_ctime(file_path, ctime_cache):
+    ctime = ctime_cache.get(file_path)
+    if ctime is None:
+        try:
+            ctime = os.path.getctime(file_path)
+        except Exception:
+            ctime = 0
+    return ctime
+
+def term_cost(term):
+    return FILTER_TERM_COSTS["filename" if term[1] == "text" and term[2] == "filename" else term[1]]
+
+def make_term_check(term, index, term_ids, ctime_cache, known):
+    # Prüffunktion (Pfad, Dokument-ID) -> bool für einen Term, Verneinung eingerechnet.
+    # Textterme nutzen für Dokumente < known die vorab berechnete Treffermenge; später
+    # indizierte Dokumente werden direkt am Text geprüft.
+    negate, kind, field, op, value, whole_word = term
+    if kind == "text" and field == "filename":
+        check = lambda file_path, doc_id: match_keyword(os.path.basename(file_path).lower(), value, whole_word)
+    elif kind == "text":
+        ids = term_ids[term]
+        check = lambda file_path, doc_id: doc_id is not None and (
+            doc_id in ids if doc_id < known else match_keyword(index.text(field, doc_id), value, whole_word))
+    elif kind == "regex":
+        # Treffermenge wird vor dem Lauf im Regex-Prozess gefüllt (FilterPlan.regex_terms)
+        ids = term_ids[term]
+        check = lambda file_path, doc_id: doc_id in ids
+    elif kind == "fuzzy":
+        ids = term_ids[term]
+        check = lambda file_path, doc_id: doc_id is not None and (
+            doc_id in ids if doc_id < known else
+            fuzzy_similarity(value, trigram_text(index.text(field, doc_id))) >= FUZZY_SIMILARITY)
+    elif kind == "size":
+        def check(file_path, doc_id):
+            try:
+                size = os.path.getsize(file_path)
+            except OSError:
+                size = 0
+            return compare_query_value(size, op, value)
+    elif kind == "age":
+        seconds, minute = value
+        check = lambda file_path, doc_id: compare_query_value(minute * 60 - file_ctime(file_path, ctime_cache), op, seconds)
+    elif kind == "modified":
+        seconds, minute = value
+
+        def check(file_path, doc_id):
+            try:
+                mtime = os.path.getmtime(file_path)
+            except OSError:
+                mtime = 0
+            return compare_query_value(minute * 60 - mtime, op, seconds)
+    elif kind == "date":
+        date_op, threshold = date_comparison(op, value)
+        check = lambda file_path, doc_id: STAT_OPERATORS[date_op](file_ctime(file_path, ctime_cache), threshold)
+    elif kind == "lora":
+        check = lambda file_path, doc_id: any(fnmatch.fnmatchcase(name, value) for name in index.loras(doc_id))
+    else:
+        def check(file_path, doc_id):
+            actual = index.params(doc_id).get(field)
+            return actual is not None and compare_query_value(actual, op, value)
+    if negate:
+        return lambda file_path, doc_id: not check(file_path, doc_id)
+    return check
+
+class FilterPlan:
+    # Kompilierter Filter für einen Lauf. Jede Klausel wird ein Prüfschritt mit Kosten
+    # (teuerster Term). Schritte ohne Metadaten (Datum, Größe, Dateiname) laufen je Datei
+    # zuerst; nur wer sie besteht, wird bei Bedarf gelesen und indiziert. Innerhalb beider
+    # Stufen entscheidet der Rang Kosten / (1 - Durchlassquote), die Quoten werden in
+    # selectivity (Klausel -> [geprüft, bestanden]) über alle Läufe hinweg mitgezählt.
+    # Reine Textklauseln werden für bereits indizierte Dokumente zusätzlich vorab als
+    # Mengenoperation auf dem Token-Index ausgewertet (allowed), reine Größen-/Datumsklauseln
+    # gemeinsam als Maske über die Stat-Spalten: select() wählt damit die Kandidaten aus, bevor
+    # die übrigen Schritte je Datei laufen. Aufbau unter index_lock.
+    # Unscharfe Terme liefern zusätzlich Ähnlichkeiten, nach denen die Treffer sortiert werden.
+    def __init__(self, index, clauses, ctime_cache, selectivity, stat_columns=None):
+        self.selectivity = selectivity
+        self.known = len(index.doc_paths)
+        term_ids = {}
+        by_field = {}
+        self.fuzzy_scores = {}
+        for clause in clauses:
+            for term in clause:
+                if term[1] == "text" and term[2] != "filename":
+                    by_field.setdefault((term[2], term[5]), set()).add(term)
+                elif term[1] == "fuzzy" and term not in term_ids:
+                    scores = index.fuzzy(term[4])
+                    term_ids[term] = set(scores)
+                    if not term[0]:
+                        self.fuzzy_scores[term] = scores
+                elif term[1] == "regex":
+                    term_ids[term] = set()
+        self.regex_terms = {term: ids for term, ids in term_ids.items() if term[1] == "regex"}
+        for (field, whole_word), terms in by_field.items():
+            terms = list(terms)
+            for term, ids in zip(terms, index.matches_each(field, [term[4] for term in terms], whole_word)):
+                term_ids[term] = ids
+        sets = []
+        self.cheap = []
+        self.metadata = []
+        self.stat_columns = stat_columns
+        self.stat_clauses = frozenset(clause for clause in clauses if all(term[1] in STAT_TERM_KINDS for term in clause))
+        if stat_columns is not None and self.stat_clauses:
+            clauses = clauses - self.stat_clauses
+            self.stat_fallback = [[make_term_check(term, None, None, ctime_cache, 0) for term in clause]
+                                  for clause in self.stat_clauses]
+        for clause in clauses:
+            cost = max(term_cost(term) for term in clause)
+            # Dateinamen-Terme haben keine vorab berechnete Menge (geprüft wird am Pfad)
+            if cost == FILTER_TERM_COSTS["text"] and all(term[1] in ("text", "fuzzy") and term[2] != "filename"
+                                                         for term in clause):
+                sets.append(set().union(*(index.live_ids - term_ids[term] if term[0] else term_ids[term]
+                                          for term in clause)))
+            step = (clause, cost, [make_term_check(term, index, term_ids, ctime_cache, self.known) for term in clause])
+            (self.cheap if cost < FILTER_METADATA_COST else self.metadata).append(step)
+        self.allowed = None
+        for ids in sorted(sets, key=len):
+            self.allowed = ids if self.allowed is None else self.allowed & ids
+        self.order()
+
+    def select(self, candidates):
+        # Kandidaten nach den Größen-/Datumsklauseln (Maske über die Stat-Spalten); ohne solche
+        # Klauseln unverändert
+        if self.stat_columns is None or not self.stat_clauses:
+            return candidates
+        fallback = self.stat_fallback
+        return self.stat_columns.select(self.stat_clauses, candidates, lambda file_path: all(
+            any(term_check(file_path, None) for term_check in checks) for checks in fallback))
+
+    def regex_candidates(self, index, term):
+        # Vorauswahl über den Index: Dokumente, die alle Pflicht-Literale des Musters enthalten
+        result = index.live_ids
+        for literal in regex_literals(term[4]):
+            ids, _ = index.candidates(term[2], literal, False)
+            if ids is not None:
+                result = result & ids
+        return sorted(result)
+
+    def rank_by_similarity(self, paths, index):
+        # Treffer unscharfer Suchen nach Ähnlichkeit ordnen; stabil, bei Gleichstand bleibt
+        # die bisherige Reihenfolge. Erst im Lauf indizierte Dokumente werden nachberechnet.
+        if not self.fuzzy_scores:
+            return paths
+
+        def similarity(file_path):
+            doc_id = index.doc_ids.get(file_path)
+            total = 0.0
+            for term, scores in self.fuzzy_scores.items():
+                score = scores.get(doc_id)
+                if score is None and doc_id is not None and doc_id >= self.known:
+                    score = fuzzy_similarity(term[4], trigram_text(index.text("prompt", doc_id)))
+                total += score or 0.0
+            return total
+        return sorted(paths, key=similarity, reverse=True)
+
+    def rank(self, step):
+        checked, passed = self.selectivity.get(step[0], (0, 0))
+        rate = (passed + 1) / (checked + 2)
+        return step[1] / max(1 - rate, 0.01)
+
+    def order(self):
+        # Nach jedem Batch erneut aufgerufen, damit die beobachteten Quoten schon im Lauf wirken
+        self.cheap.sort(key=self.rank)
+        self.metadata.sort(key=self.rank)
+
+    def passes(self, steps, file_path, doc_id, record=True):
+        # record=False für Vorab-Durchläufe, die dieselben Dateien später noch einmal prüfen
+        if not record:
+            return all(any(check(file_path, doc_id) for check in checks) for _, _, checks in steps)
+        for clause, _, checks in steps:
+            stats = self.selectivity.get(clause)
+            if stats is None:
+                stats = self.selectivity[clause] = [0, 0]
+            stats[0] += 1
+            if not any(check(file_path, doc_id) for check in checks):
+                return False
+            stats[1] += 1
+        return True
+
+    def matches(self, file_path, doc_id, read_metadata):
+        # read_metadata(file_path) -> Dokument-ID; wird nur für Dateien aufgerufen, die alle
+        # billigen Schritte bestanden haben und noch nicht indiziert sind
+        if not self.passes(self.cheap, file_path, doc_id):
+            return False
+        if not self.metadata:
+            return True
+        if doc_id is None:
+            doc_id = read_metadata(file_path)
+        elif self.allowed is not None and doc_id < self.known and doc_id not in self.allowed:
+            return False
+        return self.passes(self.metadata, file_path, doc_id)
+
+def extract_text_chunks(img_path, show_errors=True):
+    # show_errors=False für Aufrufe aus Hintergrund-Threads (kein Tk-Dialog außerhalb des Hauptthreads)
     try:
         img = Image.open(img_path)
     except Exception as e:
-        messagebox.showerror("Error", f"Error opening image:\n{e}")
+        if show_errors:
+            messagebox.showerror("Error", f"Error opening image:\n{e}")
+        else:
+            print(f"Fehler beim Öffnen von {img_path}: {e}")
         return "", "", ""
     
     is_jpeg = img_path.lower().endswith((".jpg", ".jpeg"))
@@ -553,14 +2162,21 @@ class ImageManagerForm(TkinterDnD.Tk):
 
         self.folder_images = []
         self.filtered_images = []
+        self.folder_positions = PositionIndex(self.folder_images)
+        self.filtered_positions = PositionIndex(self.filtered_images)
         self.image_cache = OrderedDict()
         self.cache_limit = 50
+        # Vorschaubilder haben einen eigenen Cache, damit sie keine Vollbilder verdrängen
+        self.thumb_cache = ThumbnailCache(byte_budget=64 * 1024 * 1024)
+        self.thumb_disk_cache = ThumbnailDiskCache(THUMBNAIL_CACHE_DIR, THUMBNAIL_CACHE_MAX_BYTES)
+        threading.Thread(target=self.thumb_disk_cache.prune, daemon=True).start()
+        self.thumb_workers = create_thumbnail_pool(THUMBNAIL_BACKEND, self.thumb_disk_cache)
+        self.thumb_poll_job = None
         self.current_index = -1
         self.fs_current_index = -1
         self.search_subfolders_var = tk.BooleanVar(value=False)
         self.search_subfolders_var.trace("w", lambda *args: threading.Thread(target=self.load_folder_async, args=(self.folder_path_var.get(),), daemon=True).start())
         self.sort_order = "DESC"
-        self.preview_images = {}
         self.fullscreen_win = None
         self.debug_info = ""
         self.filter_history = deque(maxlen=10)
@@ -571,7 +2187,30 @@ class ImageManagerForm(TkinterDnD.Tk):
         self.filter_history_list = history_data.get("filter_history", [])
 
         self.ctime_cache = {}
+        # Größe/ctime/mtime als Spalten für die vektorisierten Größen- und Datumsfilter
+        self.stat_columns = StatColumns()
         self.text_chunks_cache = {}
+        self.token_index = TokenIndex()
+        self.index_lock = threading.Lock()
+        self.filter_generation = 0
+        self.filter_job_active = False
+        self.filter_removed_paths = set()
+        self.filter_found = 0
+        self.filter_clauses = None
+        self.filter_result_cache = OrderedDict()
+        self.filter_selectivity = {}
+        self.live_filter_job = None
+        self.live_filter_text = ""
+        # Eigener Prozess für Regex-Filter (erst bei Bedarf gestartet)
+        self.regex_process = RegexProcess()
+
+        # Progressives Rendern: ausstehende Verfeinerungen und Zeitmessung pro Anzeigefläche
+        self.refine_jobs = {}
+        self.render_timings = {}
+        # Ein wiederverwendetes PhotoImage pro Anzeigefläche (main, fs, Vorschauzeilen)
+        self.photo_pool = {}
+        self.frame_cache = OrderedDict()
+        self.frame_cache_budget = FRAME_CACHE_BYTES
 
         self.delete_immediately_main_var = tk.BooleanVar(value=False)
         self.delete_immediately_fs_var = tk.BooleanVar(value=False)
@@ -582,6 +2221,7 @@ class ImageManagerForm(TkinterDnD.Tk):
         self.filter_negativ_var = tk.BooleanVar(value=False)
         self.filter_settings_var = tk.BooleanVar(value=False)
         self.whole_word_var = tk.BooleanVar(value=False)
+        self.regex_var = tk.BooleanVar(value=False)
         self.prompt_filter_mode = tk.StringVar(value="all")
         self.date_between = tk.BooleanVar(value=False)
         self.date_not_older_than = tk.BooleanVar(value=False)
@@ -804,12 +2444,17 @@ class ImageManagerForm(TkinterDnD.Tk):
         self.filter_combo['values'] = self.filter_history_list
         self.filter_combo.pack(side="left", padx=self.button_padding)
         self.filter_combo.bind("<Return>", lambda e: self.apply_filter())
+        self.filter_combo.bind("<KeyRelease>", self.schedule_live_filter)
+        self.filter_combo.bind("<<ComboboxSelected>>", lambda e: self.apply_filter())
         self.clear_button = tk.Button(filter_frame, text="Clear", command=self.clear_filter,
                                     bg=BTN_BG_COLOR, fg=BTN_FG_COLOR, font=("Arial", self.main_font_size), width=5)
         self.clear_button.pack(side="left", padx=self.button_padding)
         self.whole_word_cb = tk.Checkbutton(filter_frame, text="Whole Word", variable=self.whole_word_var,
                                             fg=TEXT_FG_COLOR, bg=BG_COLOR, selectcolor=BG_COLOR, font=("Arial", self.main_font_size))
         self.whole_word_cb.pack(side="left", padx=self.button_padding)
+        self.regex_cb = tk.Checkbutton(filter_frame, text="Regex", variable=self.regex_var, command=self.apply_filter,
+                                       fg=TEXT_FG_COLOR, bg=BG_COLOR, selectcolor=BG_COLOR, font=("Arial", self.main_font_size))
+        self.regex_cb.pack(side="left", padx=self.button_padding)
         self.filter_filename_cb = tk.Checkbutton(filter_frame, text="Filename", variable=self.filter_filename_var, command=self.apply_filter,
                                                 fg=TEXT_FG_COLOR, bg=BG_COLOR, selectcolor=BG_COLOR, font=("Arial", self.main_font_size))
         self.filter_filename_cb.pack(side="left", padx=self.button_padding)
@@ -1006,19 +2651,43 @@ class ImageManagerForm(TkinterDnD.Tk):
                                         bg=BTN_BG_COLOR, fg=BTN_FG_COLOR, font=("Arial", self.main_font_size))
         self.load_list_button.pack(pady=self.button_padding)
         self.preview_frame = tk.Frame(self, bg=BG_COLOR)
+        preview_toolbar = tk.Frame(self.preview_frame, bg=BG_COLOR)
+        preview_toolbar.pack(side="top", fill="x")
+        self.grid_view_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(preview_toolbar, text="Grid view", variable=self.grid_view_var,
+                       command=self.on_preview_mode_change, fg=TEXT_FG_COLOR, bg=BG_COLOR,
+                       selectcolor=BG_COLOR, font=("Arial", self.main_font_size)).pack(side="left", padx=self.button_padding)
+        tk.Label(preview_toolbar, text="Thumbnail size:", fg=TEXT_FG_COLOR, bg=BG_COLOR,
+                 font=("Arial", self.main_font_size)).pack(side="left", padx=self.button_padding)
+        default_thumb_size = THUMBNAIL_SIZE or int(100 * self.scaling_factor)
+        self.thumb_size_var = tk.IntVar(value=max(THUMBNAIL_SIZE_MIN, min(THUMBNAIL_SIZE_MAX, default_thumb_size)))
+        thumb_size_slider = tk.Scale(preview_toolbar, from_=THUMBNAIL_SIZE_MIN, to=THUMBNAIL_SIZE_MAX,
+                                     orient="horizontal", length=200, variable=self.thumb_size_var,
+                                     showvalue=False, bg=BG_COLOR, fg=TEXT_FG_COLOR, highlightthickness=0,
+                                     command=self.on_thumb_size_change)
+        thumb_size_slider.pack(side="left", padx=self.button_padding)
+        thumb_size_slider.bind("<ButtonRelease-1>", lambda e: self.save_thumb_size())
+        self.atlas_view_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(preview_toolbar, text="Atlas pages", variable=self.atlas_view_var,
+                       command=self.on_preview_mode_change, fg=TEXT_FG_COLOR, bg=BG_COLOR,
+                       selectcolor=BG_COLOR, font=("Arial", self.main_font_size)).pack(side="left", padx=self.button_padding)
         self.preview_canvas = tk.Canvas(self.preview_frame, bg=BG_COLOR, highlightthickness=0)
         self.preview_canvas.pack(side="left", fill="both", expand=True)
-        self.preview_scrollbar = tk.Scrollbar(self.preview_frame, orient="vertical", command=self.preview_canvas.yview)
+        self.preview_scrollbar = tk.Scrollbar(self.preview_frame, orient="vertical", command=self.on_preview_scroll)
         self.preview_scrollbar.pack(side="right", fill="y")
         self.preview_canvas.configure(yscrollcommand=self.preview_scrollbar.set)
-        self.preview_inner_frame = tk.Frame(self.preview_canvas, bg=BG_COLOR)
-        self.preview_canvas.create_window((0, 0), window=self.preview_inner_frame, anchor="nw")
-        self.preview_inner_frame.bind("<Configure>", lambda event: self.preview_canvas.configure(
-            scrollregion=self.preview_canvas.bbox("all")
-        ))
+        self.preview_canvas.bind("<Configure>", lambda e: self.update_preview_visible())
+        self.preview_canvas.bind("<Button-1>", self.on_preview_grid_click)
         self.preview_canvas.bind("<Enter>", lambda e: self.preview_canvas.bind_all("<MouseWheel>", self.on_preview_mousewheel))
         self.preview_canvas.bind("<Leave>", lambda e: self.preview_canvas.unbind_all("<MouseWheel>"))
-        self.preview_items = []
+        self.preview_rows = []
+        self.grid_cells = []
+        self.atlas_bands = []
+        self.atlas_results = queue.Queue()
+        self.atlas_font = None
+        self.preview_slot_ids = itertools.count()
+        self.preview_scrollregion = None
+        self.preview_layout = (1, 1)
         self.status("Form loaded.")
 
         self.user_scaling_override = False  # Merker, ob Benutzer manuell skaliert hat
@@ -1066,6 +2735,11 @@ class ImageManagerForm(TkinterDnD.Tk):
         set_frame = tk.Frame(self.options_win, bg=BG_COLOR)
         set_frame.pack(padx=self.button_padding, pady=(0, self.button_padding), fill="x")
         
+        self.process_thumbs_var = tk.BooleanVar(value=(THUMBNAIL_BACKEND == "process"))
+        tk.Checkbutton(self.options_win, text="Generate thumbnails in separate processes",
+                       variable=self.process_thumbs_var, bg=BG_COLOR, fg=TEXT_FG_COLOR, selectcolor=BG_COLOR,
+                       font=("Arial", self.main_font_size)).pack(anchor="w", padx=self.button_padding, before=set_frame)
+
         self.set_button = tk.Button(set_frame, text="Set", command=self.set_options,
                                     bg=BTN_BG_COLOR, fg=BTN_FG_COLOR, font=("Arial", self.main_font_size))
         self.set_button.pack(side="left", padx=(0, self.button_padding))
@@ -1101,8 +2775,9 @@ class ImageManagerForm(TkinterDnD.Tk):
 
     # Methode, um die neuen Options (Wert des Schiebereglers) zu übernehmen und zu speichern
     def set_options(self):
-        global SCALING_MULTIPLIER
+        global SCALING_MULTIPLIER, THUMBNAIL_BACKEND
         SCALING_MULTIPLIER = float(self.options_slider.get())
+        THUMBNAIL_BACKEND = "process" if self.process_thumbs_var.get() else "thread"
         save_options_settings()  # Speichert den neuen Wert in der Datei
         self.set_hint_label.config(text="Settings will be effective after restart")
 
@@ -1140,109 +2815,263 @@ class ImageManagerForm(TkinterDnD.Tk):
         self.filter_negativ_var.set(False)
         self.filter_settings_var.set(False)
         self.whole_word_var.set(False)
+        self.regex_var.set(False)
         self.clear_filter_inputs()
         self.apply_filters()
 
-    def apply_filters(self):
-        filter_text_raw = self.filter_var.get().strip().lower()
-        keywords = [f.strip() for f in filter_text_raw.split(",") if f.strip()] if filter_text_raw else []
-        self.filtered_images = []
-        for file_path in self.folder_images:
-            passes = True
-            filename = os.path.basename(file_path).lower()
-            if file_path not in self.text_chunks_cache:
-                self.text_chunks_cache[file_path] = extract_text_chunks(file_path)
-            prompt, negativ, settings = self.text_chunks_cache[file_path]
-            if self.filter_prompt_var.get():
-                prompt_lower = prompt.lower()
+    def build_filter_query_text(self):
+        # Übersetzt Filterfeld und Widgets in die Abfragesprache (siehe parse_filter_query()).
+        # Enthält das Filterfeld bereits Abfragesyntax, wird es unverändert übernommen.
+        filter_text = self.filter_var.get().strip()
+        parts = []
+        if filter_text and self.regex_var.get():
+            # Regex-Modus: der ganze Text ist ein Muster für jedes angehakte Feld
+            pattern = "/" + re.sub(r"(?<!\\)/", r"\/", filter_text) + "/"
+            fields = [field for var, field in ((self.filter_prompt_var, "prompt"), (self.filter_filename_var, "file"),
+                                               (self.filter_negativ_var, "neg"), (self.filter_settings_var, "settings"))
+                      if var.get()]
+            if "prompt" in fields and self.prompt_filter_mode.get() in ("exclude", "none"):
+                fields.remove("prompt")
+                parts.append(f"-prompt:{pattern}")
+            if fields:
+                parts.append(" OR ".join(f"{field}:{pattern}" for field in fields))
+        elif filter_text and is_filter_query(filter_text):
+            parts.append(filter_text)
+        elif filter_text:
+            # Klassische Eingabe: kommagetrennte Keywords, Modus und Feld-Checkboxen wie bisher
+            keywords = ['"' + k.strip().replace('"', '') + '"' for k in filter_text.split(",") if k.strip()]
+            if keywords and self.filter_prompt_var.get():
                 mode = self.prompt_filter_mode.get()
                 if mode == "all":
-                    for keyword in keywords:
-                        if not match_keyword(prompt_lower, keyword, self.whole_word_var.get()):
-                            passes = False
-                            break
+                    parts.extend(f"prompt:{k}" for k in keywords)
                 elif mode == "any":
-                    if not any(match_keyword(prompt_lower, keyword, self.whole_word_var.get()) for keyword in keywords):
-                        passes = False
+                    parts.append(" OR ".join(f"prompt:{k}" for k in keywords))
                 elif mode in ("exclude", "none"):
-                    if any(match_keyword(prompt_lower, keyword, self.whole_word_var.get()) for keyword in keywords):
-                        passes = False
-            if passes and self.filter_filename_var.get():
-                if not any(match_keyword(filename, keyword, self.whole_word_var.get()) for keyword in keywords):
-                    passes = False
-            if passes and self.filter_negativ_var.get():
-                if not any(match_keyword(negativ.lower(), keyword, self.whole_word_var.get()) for keyword in keywords):
-                    passes = False
-            if passes and self.filter_settings_var.get():
-                if not any(match_keyword(settings.lower(), keyword, self.whole_word_var.get()) for keyword in keywords):
-                    passes = False
-            if passes and ((hasattr(self, "entry_min_size") and self.entry_min_size.get().strip()) or 
-                           (hasattr(self, "entry_max_size") and self.entry_max_size.get().strip())):
-                try:
-                    file_size_kb = os.path.getsize(file_path) / 1024
-                except Exception:
-                    file_size_kb = 0
-                if self.entry_min_size.get().strip():
-                    if file_size_kb < int(self.entry_min_size.get().strip()):
-                        passes = False
-                if passes and self.entry_max_size.get().strip():
-                    if file_size_kb > int(self.entry_max_size.get().strip()):
-                        passes = False
-            if passes:
-                now_ts = datetime.now().timestamp()
+                    parts.extend(f"-prompt:{k}" for k in keywords)
+            for var, field in ((self.filter_filename_var, "file"), (self.filter_negativ_var, "neg"),
+                               (self.filter_settings_var, "settings")):
+                if keywords and var.get():
+                    parts.append(" OR ".join(f"{field}:{k}" for k in keywords))
+        for entry_name, op in (("entry_min_size", ">="), ("entry_max_size", "<=")):
+            value = parse_int_or_none(getattr(self, entry_name).get().strip()) if hasattr(self, entry_name) else None
+            if value is not None:
+                parts.append(f"size{op}{value}KB")
+        for var, days in ((self.date_this_week, 7), (self.date_two_weeks, 14), (self.date_four_weeks, 21),
+                          (self.date_one_month, 30), (self.date_one_year, 365)):
+            if var.get():
+                parts.append(f"age<={days}d")
+        not_older = parse_int_or_none(self.entry_not_older.get().strip()) if hasattr(self, 'entry_not_older') else None
+        if not_older is not None:
+            parts.append(f"age<={not_older}d")
+        older = parse_int_or_none(self.entry_older.get().strip()) if hasattr(self, 'entry_older') else None
+        if older is not None:
+            parts.append(f"age>={older}d")
+        start_date_str = self.entry_start_date.get().strip() if hasattr(self, 'entry_start_date') else ""
+        end_date_str = self.entry_end_date.get().strip() if hasattr(self, 'entry_end_date') else ""
+        if start_date_str and end_date_str:
+            try:
+                datetime.strptime(start_date_str, "%Y-%m-%d")
+                datetime.strptime(end_date_str, "%Y-%m-%d")
+                parts.append(f"date>={start_date_str} date<={end_date_str}")
+            except ValueError:
+                pass
+        return " ".join(parts)
+
+    def snapshot_filter_query(self):
+        # Liest alle Filtereingaben im Tk-Thread; der Hintergrund-Thread sieht nur die Klauseln
+        query_text = self.build_filter_query_text()
+        return parse_filter_query(query_text, self.whole_word_var.get()), query_text
+
+    def apply_filters(self, live=False):
+        # Filter im Hintergrund auswerten. Jede neue Anfrage erhöht die Generation; ältere
+        # Läufe brechen bei der nächsten Datei ab und ihre Ergebnisse werden verworfen.
+        # live: ausgelöst beim Tippen; halbfertige Anfragen sind dann kein Fehler.
+        if self.live_filter_job is not None:
+            self.after_cancel(self.live_filter_job)
+            self.live_filter_job = None
+        self.live_filter_text = self.filter_var.get()
+        try:
+            clauses, query_text = self.snapshot_filter_query()
+        except FilterQueryError as e:
+            if not live:
+                self.status(f"Query error: {e}")
+            return
+        if query_text and not live:
+            self.status(f"Query: {query_text}")
+        self.filter_generation += 1
+        generation = self.filter_generation
+        self.filter_removed_paths = set()
+        self.filter_found = 0
+        cached = self.filter_result_cache.get(clauses)
+        if cached is not None:
+            self.filter_result_cache.move_to_end(clauses)
+            self.filter_job_active = False
+            self.on_filter_finished(generation, list(cached), clauses)
+            return
+        # Engere Anfrage (Obermenge der Klauseln): nur die aktuellen Treffer mit den neuen
+        # Klauseln prüfen. Weitere Anfrage (Teilmenge): nur die bisher ausgefilterten Dateien prüfen.
+        previous = self.filter_clauses
+        if previous is not None and previous <= clauses:
+            mode = "narrow"
+        elif previous is not None and clauses <= previous:
+            mode = "widen"
+        else:
+            mode = "full"
+        self.filter_job_active = True
+        self.status("Filtering..." if mode == "full" else f"Filtering ({mode})...")
+        threading.Thread(target=self.filter_worker,
+                         args=(generation, clauses, previous, mode, list(self.folder_images), list(self.filtered_images)),
+                         daemon=True).start()
+
+    def cancel_filter(self):
+        self.filter_generation += 1
+        self.filter_job_active = False
+
+    def filter_worker(self, generation, clauses, previous, mode, paths, base):
+        index = self.token_index
+        try:
+            if mode == "narrow":
+                candidates = base
+                check_clauses = clauses - previous
+            elif mode == "widen":
+                base_set = set(base)
+                candidates = [file_path for file_path in paths if file_path not in base_set]
+                check_clauses = clauses
+                self.after(0, lambda: self.on_filter_batch(generation, len(base), 0, len(candidates)))
+            else:
+                candidates = paths
+                check_clauses = clauses
+
+            # Metadaten werden erst gelesen, wenn eine Datei alle billigen Prüfungen bestanden hat
+            with self.index_lock:
+                plan = FilterPlan(index, check_clauses, self.ctime_cache, self.filter_selectivity, self.stat_columns)
+            # Größe/Datum über die Stat-Maske vorab; die Schleife unten prüft nur die übrigen Schritte
+            candidates = plan.select(candidates)
+            total = len(candidates)
+            if plan.regex_terms and not self.match_regex_terms(plan, candidates, generation):
+                return
+            read = [0]
+
+            def read_metadata(file_path):
+                read[0] += 1
+                return self.index_file_metadata(file_path)
+
+            result = []
+            batch = []
+            if not plan.cheap and not plan.metadata:
+                # Nur Größe/Datum: die Auswahl ist schon das Ergebnis
+                result = candidates
+                self.after(0, lambda: self.on_filter_batch(generation, total, total, total))
+            else:
+                for n, file_path in enumerate(candidates, 1):
+                    if generation != self.filter_generation:
+                        return
+                    if plan.matches(file_path, index.doc_ids.get(file_path), read_metadata):
+                        batch.append(file_path)
+                    if n % FILTER_BATCH_SIZE == 0 or n == total:
+                        result.extend(batch)
+                        self.after(0, lambda found=len(batch), n=n: self.on_filter_batch(generation, found, n, total))
+                        if read[0]:
+                            self.after(0, lambda n=n, count=read[0]: self.on_filter_progress(
+                                generation, f"Reading metadata... {count} files read, {n}/{total} checked"))
+                        batch = []
+                        plan.order()
+            if mode == "widen":
+                # Bisherige und neue Treffer in Ordnerreihenfolge zusammenführen
+                added = set(result)
+                result = [file_path for file_path in paths if file_path in base_set or file_path in added]
+            result = plan.rank_by_similarity(result, index)
+        except Exception as e:
+            print(f"Fehler beim Filtern: {e}")
+            message = f"Filter error: {e}"
+            self.after(0, lambda: self.on_filter_failed(generation, message))
+            return
+        self.after(0, lambda: self.on_filter_finished(generation, result, clauses))
+
+    def match_regex_terms(self, plan, candidates, generation):
+        # Regex braucht den Text: zuerst fehlende Metadaten der Kandidaten lesen, die die billigen
+        # Prüfungen bestehen, dann jedes Muster blockweise im Regex-Prozess auswerten.
+        # False bei Abbruch oder zu teurem Muster (dann ist der Lauf beendet).
+        index = self.token_index
+        for n, file_path in enumerate(candidates, 1):
+            if generation != self.filter_generation:
+                return False
+            if file_path not in index and plan.passes(plan.cheap, file_path, None, record=False):
+                self.index_file_metadata(file_path)
+            if n % FILTER_BATCH_SIZE == 0:
+                self.after(0, lambda n=n: self.on_filter_progress(
+                    generation, f"Reading metadata... {n}/{len(candidates)}"))
+        for term, matched in plan.regex_terms.items():
+            field, pattern = term[2], term[4]
+            with self.index_lock:
+                docs = [(doc_id, index.text(field, doc_id)) for doc_id in plan.regex_candidates(index, term)]
+            for start in range(0, len(docs), REGEX_CHUNK_SIZE):
+                if generation != self.filter_generation:
+                    return False
+                chunk = docs[start:start + REGEX_CHUNK_SIZE]
                 try:
-                    ctime = os.path.getctime(file_path)
-                except Exception:
-                    ctime = 0
-                if self.date_this_week.get():
-                    if (now_ts - ctime) > 7 * 24 * 3600:
-                        passes = False
-                if passes and self.date_two_weeks.get():
-                    if (now_ts - ctime) > 14 * 24 * 3600:
-                        passes = False
-                if passes and self.date_four_weeks.get():
-                    if (now_ts - ctime) > 21 * 24 * 3600:
-                        passes = False
-                if passes and self.date_one_month.get():
-                    if (now_ts - ctime) > 30 * 24 * 3600:
-                        passes = False
-                if passes and self.date_one_year.get():
-                    if (now_ts - ctime) > 365 * 24 * 3600:
-                        passes = False
-
-                # Neue benutzerdefinierte Datumseingaben auswerten:
-                not_older = self.entry_not_older.get().strip() if hasattr(self, 'entry_not_older') else ""
-                if not_older:
-                    try:
-                        not_older_days = int(not_older)
-                        if (now_ts - ctime) > not_older_days * 24 * 3600:
-                            passes = False
-                    except ValueError:
-                        pass
-                older = self.entry_older.get().strip() if hasattr(self, 'entry_older') else ""
-                if older:
-                    try:
-                        older_days = int(older)
-                        if (now_ts - ctime) < older_days * 24 * 3600:
-                            passes = False
-                    except ValueError:
-                        pass
-                start_date_str = self.entry_start_date.get().strip() if hasattr(self, 'entry_start_date') else ""
-                end_date_str = self.entry_end_date.get().strip() if hasattr(self, 'entry_end_date') else ""
-                if start_date_str and end_date_str:
-                    try:
-                        start_ts = datetime.strptime(start_date_str, "%Y-%m-%d").timestamp()
-                        end_ts = datetime.strptime(end_date_str, "%Y-%m-%d").timestamp()
-                        if not (start_ts <= ctime <= end_ts):
-                            passes = False
-                    except ValueError:
-                        pass
+                    hits = self.regex_process.search(pattern, [text for _, text in chunk], REGEX_CHUNK_BUDGET,
+                                                     lambda: generation == self.filter_generation)
+                except RegexTooExpensive:
+                    self.after(0, lambda: self.on_filter_failed(
+                        generation, f"Regex /{pattern}/ is too expensive (over {REGEX_CHUNK_BUDGET:g} s), filter aborted."))
+                    return False
+                if hits is None:
+                    return False
+                matched.update(chunk[i][0] for i in hits)
+                self.after(0, lambda done=start + len(chunk), total=len(docs): self.on_filter_progress(
+                    generation, f"Matching /{pattern}/... {done}/{total}"))
+        return True
+
+    def on_filter_failed(self, generation, message):
+        if generation == self.filter_generation:
+            self.filter_job_active = False
+            self.status(message)
+
+    def index_file_metadata(self, file_path):
+        # Liest die Metadaten einer Datei (außerhalb der Sperre) und nimmt sie in den Index auf.
+        # Hat ein überlappender Lauf die Datei inzwischen aufgenommen, gilt dessen ID: ein
+        # erneutes add() würde sie entfernen, während der andere Lauf sie noch benutzt.
+        chunks = self.text_chunks_cache.get(file_path)
+        if chunks is None:
+            chunks = extract_text_chunks(file_path, show_errors=False)
+            self.text_chunks_cache[file_path] = chunks
+        with self.index_lock:
+            doc_id = self.token_index.doc_ids.get(file_path)
+            if doc_id is not None:
+                return doc_id
+            return self.token_index.add(file_path, *chunks)
+
+    def on_filter_progress(self, generation, message):
+        if generation == self.filter_generation:
+            self.status(message)
+
+    def on_filter_batch(self, generation, found, checked, total):
+        # Live-Fortschritt in den Zählern; die Bildliste selbst wird erst am Ende getauscht
+        if generation != self.filter_generation:
+            return
+        self.filter_found += found
+        self.image_counter_label.config(text=f"Folder: {len(self.folder_images)} images, checked {checked}/{total}, filtered ")
+        self.filtered_counter_label.config(text=f"{self.filter_found}")
 
-            if passes:
-                self.filtered_images.append(file_path)
+    def on_filter_finished(self, generation, result, clauses):
+        if generation != self.filter_generation:
+            return
+        self.filter_job_active = False
+        if self.filter_removed_paths:
+            # Während des Laufs gelöschte Dateien nicht wieder einblenden
+            result = [file_path for file_path in result if file_path not in self.filter_removed_paths]
+        else:
+            self.filter_result_cache[clauses] = tuple(result)
+            self.filter_result_cache.move_to_end(clauses)
+            while len(self.filter_result_cache) > FILTER_RESULT_CACHE_SIZE:
+                self.filter_result_cache.popitem(last=False)
+        self.filter_clauses = clauses
+        self.filtered_images = result
+        self.filtered_positions.reset(self.filtered_images)
         if self.filtered_images:
-            if self.current_index != -1 and hasattr(self, 'current_image_path') and self.current_image_path in self.filtered_images:
-                self.current_index = self.filtered_images.index(self.current_image_path)
+            if self.current_index != -1 and hasattr(self, 'current_image_path') and self.current_image_path in self.filtered_positions:
+                self.current_index = self.filtered_positions.index(self.current_image_path)
             else:
                 self.current_index = 0
                 self.current_index = validate_index(self.current_index, self.filtered_images)
@@ -1253,18 +3082,54 @@ class ImageManagerForm(TkinterDnD.Tk):
             self.current_index = -1
             self.status("Filter applied: 0 images found.")
         self.populate_preview_table_lazy()
-        total_images = len(self.folder_images)
-        filtered_images = len(self.filtered_images)
-        self.image_counter_label.config(text=f"Folder: {total_images} images filtered ")
-        self.filtered_counter_label.config(text=f"{filtered_images}")
+        self.update_image_counters()
+        self.status(f"Filter applied: {len(self.filtered_images)} images found.")
+
+    def update_image_counters(self):
+        self.image_counter_label.config(text=f"Folder: {len(self.folder_images)} images filtered ")
+        self.filtered_counter_label.config(text=f"{len(self.filtered_images)}")
         self.image_counter_suffix_label.config(text=" images")
-        self.status(f"Filter applied: {filtered_images} images found.")
-        if filter_text_raw and filter_text_raw not in self.filter_history_list:
-            self.filter_history_list.insert(0, filter_text_raw)
-            self.filter_history_list = self.filter_history_list[:10]
-            self.filter_combo['values'] = self.filter_history_list
-            save_history(self.folder_history, self.filter_history_list)
-        self.update_filter_button_color()
+
+    def remove_image_from_lists(self, file_path):
+        # Gelöschtes Bild aus Ordner- und Filterliste nehmen, ohne den Filter neu anzuwenden.
+        # Gibt die bisherige Position in filtered_images zurück (-1, falls nicht gefiltert).
+        if file_path in self.folder_positions:
+            self.folder_positions.remove(file_path)
+        delete_index = -1
+        if file_path in self.filtered_positions:
+            delete_index = self.filtered_positions.remove(file_path)
+        self.ctime_cache.pop(file_path, None)
+        self.stat_columns.remove(file_path)
+        self.text_chunks_cache.pop(file_path, None)
+        with self.index_lock:
+            self.token_index.remove(file_path)
+        if self.filter_job_active:
+            self.filter_removed_paths.add(file_path)
+        # filter_clauses bleibt gültig (filtered_images wurde mitgeführt), gespeicherte Ergebnisse nicht
+        self.filter_result_cache.clear()
+        self.thumb_cache.discard(file_path)
+        self.populate_preview_table_lazy()
+        self.update_image_counters()
+        return delete_index
+
+    def scroll_preview_to_current(self):
+        # Hält das aktuelle Bild in der Vorschauliste sichtbar (Liste und Raster)
+        if not self.preview_frame.winfo_ismapped() or not 0 <= self.current_index < len(self.filtered_images):
+            return
+        height, columns = self.preview_layout
+        region_height = self.preview_scrollregion[3] if self.preview_scrollregion else 0
+        if region_height <= 0:
+            return
+        top = (self.current_index // columns) * height
+        view_top = self.preview_canvas.canvasy(0)
+        view_bottom = view_top + self.preview_canvas.winfo_height()
+        if top < view_top:
+            self.preview_canvas.yview_moveto(top / region_height)
+        elif top + height > view_bottom:
+            self.preview_canvas.yview_moveto((top + height - self.preview_canvas.winfo_height()) / region_height)
+        else:
+            return
+        self.update_preview_visible()
 
     def update_filter_button_color(self):
         filter_active = False
@@ -1405,8 +3270,15 @@ class ImageManagerForm(TkinterDnD.Tk):
             self.sort_button.config(text="DESC")
         if self.folder_images:
             self.folder_images.sort(key=lambda x: self.ctime_cache[x], reverse=(self.sort_order == "DESC"))
+            self.folder_positions.reset(self.folder_images)
+            self.filter_result_cache.clear()
             if self.filtered_images:
                 self.filtered_images.sort(key=lambda x: self.ctime_cache[x], reverse=(self.sort_order == "DESC"))
+                self.filtered_positions.reset(self.filtered_images)
+                self.populate_preview_table_lazy()
+            if self.filter_job_active:
+                # Laufender Filter arbeitet noch mit der alten Reihenfolge
+                self.apply_filters()
             if self.filtered_images:
                 self.current_index = 0
                 self.display_image_safe_async(self.filtered_images[self.current_index])
@@ -1448,6 +3320,23 @@ class ImageManagerForm(TkinterDnD.Tk):
             cache_info += f"Last cached images:\n{cache_paths}\n"
         else:
             cache_info += "No images currently cached.\n"
+        cache_info += (f"Frame cache: {len(self.frame_cache)} rendered frames, "
+                       f"{sum(frame_bytes(frame) for frame in self.frame_cache.values()) // 1024} of "
+                       f"{self.frame_cache_budget // 1024} KB\n")
+        cache_info += (f"Thumbnail cache: {len(self.thumb_cache)} thumbnails, "
+                       f"{self.thumb_cache.bytes_used // 1024} of {self.thumb_cache.byte_budget // 1024} KB\n")
+        cache_info += f"Photo pool: {len(self.photo_pool)} display surfaces\n"
+        cache_info += (f"Preview widgets: {len(self.preview_rows)} list rows, {len(self.grid_cells)} grid cells, "
+                       f"{len(self.atlas_bands)} atlas pages\n")
+        render_info = "Render timing (decode / preview / refine):\n"
+        if self.render_timings:
+            for surface, timing in self.render_timings.items():
+                phases = [f"{timing[phase]:.1f} ms" if timing[phase] is not None else "-"
+                          for phase in ("decode", "preview", "refine")]
+                render_info += (f"{surface}: {timing['file']} {timing['size'][0]}x{timing['size'][1]} - "
+                                f"{' / '.join(phases)} (frame cache: {timing['cache']})\n")
+        else:
+            render_info += "No image rendered yet.\n"
         updated_debug = (
             f"Image name: {bildname}\n\n"
             f"{extraction_method}\n\n"
@@ -1456,6 +3345,7 @@ class ImageManagerForm(TkinterDnD.Tk):
             f"{python_version}\n"
             f"{monitor_info}\n\n"
             f"{cache_info}\n"
+            f"{render_info}\n"
             f"Debug details:\n"
             f"{self.debug_info if self.debug_info else 'No debug information available.'}"
         )
@@ -1474,6 +3364,8 @@ class ImageManagerForm(TkinterDnD.Tk):
         close_btn.pack(side="right", padx=self.button_padding, pady=self.button_padding)
         def clear_image_cache():
             self.image_cache.clear()
+            self.frame_cache.clear()
+            self.thumb_cache.clear()
             self.status("Image cache cleared.")
             messagebox.showinfo("Cache", "Image cache has been cleared.")
         clear_cache_btn = tk.Button(debug_win, text="Clear Cache", command=clear_image_cache,
@@ -1487,6 +3379,10 @@ class ImageManagerForm(TkinterDnD.Tk):
         self.preview_canvas.yview_scroll(int(-1 * (event.delta / 120)), "units")
         self.update_preview_visible()
 
+    def on_preview_scroll(self, *args):
+        self.preview_canvas.yview(*args)
+        self.update_preview_visible()
+
     def on_image_mousewheel(self, event):
         if event.delta > 0:
             self.show_previous_image()
@@ -1500,6 +3396,35 @@ class ImageManagerForm(TkinterDnD.Tk):
 
     def apply_filter(self):
         self.apply_filters()
+        self.remember_filter_text()
+        self.update_filter_button_color()
+
+    def remember_filter_text(self):
+        # Nur bestätigte Filter (Return, Button, Checkboxen) landen im Verlauf, nicht jede Eingabe
+        filter_text_raw = self.filter_var.get().strip()
+        if filter_text_raw and filter_text_raw not in self.filter_history_list:
+            self.filter_history_list.insert(0, filter_text_raw)
+            self.filter_history_list = self.filter_history_list[:10]
+            self.filter_combo['values'] = self.filter_history_list
+            save_history(self.folder_history, self.filter_history_list)
+
+    def schedule_live_filter(self, event=None):
+        # Suche beim Tippen: jede Änderung bricht die laufende Auswertung sofort ab, ausgewertet
+        # wird erst nach LIVE_FILTER_DELAY_MS ohne weitere Eingabe
+        text = self.filter_var.get()
+        if text == self.live_filter_text:
+            return
+        self.live_filter_text = text
+        if self.live_filter_job is not None:
+            self.after_cancel(self.live_filter_job)
+        if self.filter_job_active:
+            self.cancel_filter()
+        self.live_filter_job = self.after(LIVE_FILTER_DELAY_MS, self.run_live_filter)
+
+    def run_live_filter(self):
+        self.live_filter_job = None
+        self.apply_filters(live=True)
+        self.update_filter_button_color()
 
     # Erweiterte highlight_text-Methode inklusive der neuen Anforderungen
     def highlight_text(self, text_widget, text, filter_text_raw):
@@ -1510,19 +3435,14 @@ class ImageManagerForm(TkinterDnD.Tk):
         text_widget.tag_remove("weighting", "1.0", tk.END)
         
         # Bestehendes Filter-Highlighting (Keywords)
-        if filter_text_raw:
-            keywords = [k.strip().lower() for k in filter_text_raw.split(",") if k.strip()]
-            text_lower = text.lower()
-            for keyword in keywords:
-                start_pos = 0
-                while True:
-                    pos = text_lower.find(keyword, start_pos)
-                    if pos == -1:
-                        break
-                    start = f"1.0 + {pos} chars"
-                    end = f"1.0 + {pos + len(keyword)} chars"
-                    text_widget.tag_add("highlight", start, end)
-                    start_pos = pos + len(keyword)
+        keywords = query_highlight_keywords(filter_text_raw) if filter_text_raw else []
+        if keywords:
+            # Ein Durchlauf über den Text für alle Keywords (gleicher Automat wie im Filter)
+            matcher = get_keyword_matcher(keywords, self.whole_word_var.get())
+            for pos, pos_end, _ in matcher.find_all(text.lower()):
+                start = f"1.0 + {pos} chars"
+                end = f"1.0 + {pos_end} chars"
+                text_widget.tag_add("highlight", start, end)
             text_widget.tag_config("highlight", foreground=HIGHLIGHT_COLOR)
         
         import re
@@ -1558,8 +3478,16 @@ class ImageManagerForm(TkinterDnD.Tk):
         self.status("Loading folder in background...")
         # Leere vorhandene Listen und Caches
         self.folder_images = []
+        self.folder_positions.reset(self.folder_images)
+        self.cancel_filter()
+        self.filter_clauses = None
+        self.filter_result_cache.clear()
+        self.filter_selectivity.clear()
         self.ctime_cache.clear()
+        self.stat_columns.clear()
         self.text_chunks_cache.clear()
+        with self.index_lock:
+            self.token_index.clear()
         self.abort_loading = False
 
         def worker():
@@ -1578,7 +3506,9 @@ class ImageManagerForm(TkinterDnD.Tk):
                 if p.suffix.lower() in IMAGE_EXTENSIONS:
                     norm_path = os.path.normpath(str(p))
                     chunk.append(norm_path)
-                    self.ctime_cache[norm_path] = os.path.getctime(norm_path)
+                    stat_result = os.stat(norm_path)
+                    self.ctime_cache[norm_path] = stat_result.st_ctime
+                    self.stat_columns.add(norm_path, stat_result)
                 if total % chunk_size == 0:
                     self.after(0, lambda c=chunk: self.folder_images.extend(c))
                     self.after(0, lambda: self.status(f"Reading files... {total} processed"))
@@ -1595,13 +3525,17 @@ class ImageManagerForm(TkinterDnD.Tk):
 
 
     def on_folder_loaded(self, folder, file_path):
+        # Filterläufe während des Ladens sahen nur einen Teil des Ordners: deren Ergebnisse
+        # dürfen weder aus dem Cache kommen noch als Basis zum Einengen dienen
+        self.filter_clauses = None
+        self.filter_result_cache.clear()
         if self.folder_images:
             if file_path:
                 file_path = os.path.normpath(file_path)
                 self.status(f"Debug: Selected path: {file_path}")
                 self.status(f"Debug: First path in folder_images: {self.folder_images[0] if self.folder_images else 'Empty'}")
-            if file_path and file_path in self.folder_images:
-                self.current_index = self.folder_images.index(file_path)
+            if file_path and file_path in self.folder_positions:
+                self.current_index = self.folder_positions.index(file_path)
                 self.status(f"Debug: Image found, Index: {self.current_index}")
             else:
                 self.current_index = 0 if len(self.folder_images) > 0 else -1
@@ -1610,8 +3544,8 @@ class ImageManagerForm(TkinterDnD.Tk):
             if self.current_index != -1:
                 self.display_image_safe_async(self.folder_images[self.current_index], default_scale=True)
                 self.extract_and_display_text_chunks(self.folder_images[self.current_index])
+            self.status(f"Folder loaded: {folder} ({len(self.folder_images)} images)")
             self.apply_filter()
-            self.status(f"Folder loaded: {folder} ({len(self.folder_images)} images, {len(self.filtered_images)} filtered)")
         else:
             self.status("No images found in the selected folder.")
 
@@ -1687,9 +3621,14 @@ class ImageManagerForm(TkinterDnD.Tk):
             "3. **Right Panel - Main Controls:**\n"
             "   - **Filter Section:**\n"
             "     - \"Filter\" Button: Applies the keyword filter entered in the text field.\n"
-            "     - Text Field: Enter keywords (comma-separated) to filter images.\n"
+            "     - Text Field: Enter keywords (comma-separated) to filter images, or a query such as\n"
+            "       prompt:\"red dress\" -neg:blurry steps>=30 sampler:\"DPM++ 2M\" size<2MB age<7d lora:detail*\n"
+            "       (space = AND, OR between terms, '-' = NOT, prompt~word = typo-tolerant; fields: prompt, neg, settings, file, lora,\n"
+            "       size, age, modified, date and any settings parameter such as steps, sampler, cfg, seed, model).\n"
             "     - \"Clear\" Button: Clears the keyword filter.\n"
             "     - \"Whole Word\" Checkbox: Filters for exact word matches only.\n"
+            "     - \"Regex\" Checkbox: The text field is a regular expression for the checked fields\n"
+            "       (in queries: prompt:/pattern/, settings:/seed: 12345\\d{3}/). Patterns that take too long are aborted.\n"
             "     - Checkboxes (\"Filename\", \"Prompt\", \"Negative Prompt\", \"Settings\"): Select which fields to search for keywords.\n"
             "   - **Folder Section:**\n"
             "     - \"Folder path\" Dropdown: Select or enter a folder path (history saved).\n"
@@ -1742,7 +3681,7 @@ class ImageManagerForm(TkinterDnD.Tk):
             "- Esc or F11: Close fullscreen\n"
             "- Right Arrow: Next image\n"
             "- Left Arrow: Previous image\n"
-            "- Ctrl + Mouse Wheel: Zoom in/out - comes later\n"
+            "- Ctrl + Mouse Wheel: Zoom in/out\n"
             "- Delete: Delete current image\n"
             "- P: Toggle Prompt visibility\n\n"
             "---\n\n"
@@ -1767,18 +3706,130 @@ class ImageManagerForm(TkinterDnD.Tk):
         close_btn.pack(pady=self.button_padding)
         
     def populate_preview_table_lazy(self):
-        for widget in self.preview_inner_frame.winfo_children():
-            widget.destroy()
-        self.preview_items = []
-        for i, file_path in enumerate(self.filtered_images):
-            frame = tk.Frame(self.preview_inner_frame, bg=BG_COLOR, bd=1, relief="solid")
-            frame.grid(row=i, column=0, sticky="ew", padx=2, pady=2)
-            tk.Label(frame, text=os.path.basename(file_path), fg=TEXT_FG_COLOR, bg=BG_COLOR, font=("Arial", self.main_font_size)
-                     ).pack(side="left", padx=self.button_padding)
-            frame.bind("<Button-1>", lambda e, idx=i: self.on_preview_click(idx))
-            self.preview_items.append(frame)
+        # Virtuelle Liste bzw. virtuelles Raster: es gibt nur so viele Widgets/Canvas-Items,
+        # wie in den Sichtbereich passen (plus Überhang); beim Scrollen werden sie an andere
+        # Indizes gebunden. Die Scrollregion umfasst die volle Listenlänge.
+        for row in self.preview_rows:
+            row.index = -1
+        for cell in self.grid_cells:
+            cell.index = -1
+        for band in self.atlas_bands:
+            band.band = -1
         self.update_preview_visible()
 
+    def on_preview_mode_change(self):
+        # Beim Wechsel zwischen Liste und Raster (oder neuer Zellgröße) alles neu binden;
+        # die Widgets/Items des jeweils anderen Modus werden samt PhotoImages freigegeben.
+        grid = self.grid_view_var.get()
+        atlas = grid and self.atlas_view_var.get()
+        if grid:
+            self.release_preview_rows(self.preview_rows)
+            self.preview_rows = []
+        if not grid or atlas:
+            self.release_preview_rows(self.grid_cells)
+            self.grid_cells = []
+        if not atlas:
+            self.release_preview_rows(self.atlas_bands)
+            self.atlas_bands = []
+        for row in self.preview_rows + self.grid_cells:
+            row.index = -1
+        for band in self.atlas_bands:
+            band.band = -1
+        self.preview_canvas.yview_moveto(0)
+        self.update_preview_visible()
+
+    def release_preview_rows(self, rows):
+        # Gibt Zeilen-Widgets bzw. Raster-Items und ihre gepoolten PhotoImages frei
+        for row in rows:
+            if isinstance(row, AtlasBand):
+                self.photo_pool.pop(("atlas", row.slot), None)
+                self.preview_canvas.delete(row.item_id)
+            elif isinstance(row, PreviewGridCell):
+                self.photo_pool.pop(("grid", row.slot), None)
+                self.preview_canvas.delete(row.image_id, row.text_id)
+            else:
+                self.photo_pool.pop(("preview", row.slot), None)
+                self.preview_canvas.delete(row.window_id)
+                row.destroy()
+
+    def trim_preview_rows(self, rows, needed):
+        # Nach Verkleinern des Fensters bzw. größerer Zellgröße überzählige, versteckte
+        # Zeilen freigeben, damit der Tk-Speicher nicht auf dem Höchststand stehen bleibt.
+        if len(rows) <= needed + PREVIEW_OVERSCAN_ROWS * 2:
+            return rows
+        keep = [row for row in rows if row.index >= 0]
+        spare = [row for row in rows if row.index < 0]
+        self.release_preview_rows(spare)
+        return keep
+
+    def set_preview_scrollregion(self, height, increment):
+        # Scrollregion nur bei Änderung setzen und die Position an das neue Ende klemmen
+        region = (0, 0, max(1, self.preview_canvas.winfo_width()), height)
+        if region != self.preview_scrollregion:
+            self.preview_scrollregion = region
+            self.preview_canvas.configure(scrollregion=region, yscrollincrement=increment)
+            self.preview_canvas.yview_moveto(self.preview_canvas.yview()[0])
+
+    def get_preview_thumb_size(self):
+        return self.thumb_size_var.get()
+
+    def on_thumb_size_change(self, value=None):
+        # Neue Größe ohne Neu-Dekodieren: die Vorschaubilder kommen aus der nächstgrößeren
+        # Stufe im Speicher-Cache, fehlende größere Stufen liest der Worker aus dem
+        # Festplatten-Cache. Das oberste sichtbare Bild bleibt oben im Sichtbereich.
+        height, columns = self.preview_layout
+        first_index = int(max(0, self.preview_canvas.canvasy(0)) // height) * columns
+        self.populate_preview_table_lazy()
+        height, columns = self.preview_layout
+        region_height = self.preview_scrollregion[3] if self.preview_scrollregion else 0
+        if region_height > 0:
+            self.preview_canvas.yview_moveto((first_index // columns) * height / region_height)
+            self.update_preview_visible()
+
+    def save_thumb_size(self):
+        global THUMBNAIL_SIZE
+        THUMBNAIL_SIZE = self.thumb_size_var.get()
+        save_options_settings()
+
+    def get_grid_geometry(self):
+        # Zellbreite/-höhe (Bild + eine Zeile Beschriftung) und Spaltenzahl des Rasters
+        thumb_size = self.get_preview_thumb_size()
+        cell_width = thumb_size + 2 * PREVIEW_ROW_PADDING
+        cell_height = cell_width + 2 * self.main_font_size
+        columns = max(1, self.preview_canvas.winfo_width() // cell_width)
+        return thumb_size, cell_width, cell_height, columns
+
+    def get_preview_row_height(self):
+        return self.get_preview_thumb_size() + 2 * PREVIEW_ROW_PADDING
+
+    def create_preview_row(self):
+        row = tk.Frame(self.preview_canvas, bg=BG_COLOR, bd=1, relief="solid")
+        row.pack_propagate(False)
+        row.slot = next(self.preview_slot_ids)
+        row.index = -1
+        row.file_path = None
+        row.thumb_loaded = False
+        row.thumb_label = tk.Label(row, bg=BG_COLOR)
+        row.thumb_label.pack(side="left")
+        row.text_label = tk.Label(row, fg=TEXT_FG_COLOR, bg=BG_COLOR, font=("Arial", self.main_font_size))
+        row.text_label.pack(side="left", padx=self.button_padding)
+        for widget in (row, row.thumb_label, row.text_label):
+            widget.bind("<Button-1>", lambda e, r=row: self.on_preview_click(r.index))
+        row.window_id = self.preview_canvas.create_window(0, 0, window=row, anchor="nw", state="hidden")
+        return row
+
+    def bind_preview_row(self, row, index, thumb_size):
+        row.index = index
+        row.file_path = self.filtered_images[index]
+        row.text_label.config(text=os.path.basename(row.file_path))
+        self.preview_canvas.coords(row.window_id, 0, index * (thumb_size + 2 * PREVIEW_ROW_PADDING))
+        thumb = self.thumb_cache.get(row.file_path, thumb_size)
+        if thumb is not None:
+            self.show_preview_thumbnail(row, thumb, thumb_size)
+        else:
+            row.thumb_label.config(image=self.get_thumbnail_placeholder(thumb_size))
+            row.thumb_loaded = False
+
     def toggle_folder_list(self):
         if self.preview_frame.winfo_ismapped():
             self.preview_frame.pack_forget()
@@ -1789,34 +3840,257 @@ class ImageManagerForm(TkinterDnD.Tk):
             self.load_list_button.config(text="Hide folder list")
 
     def update_preview_visible(self):
-        canvas_height = self.preview_canvas.winfo_height()
-        scroll_region = self.preview_canvas.bbox("all")
-        if not scroll_region:
+        # Zeilen-Widgets an den sichtbaren Bereich binden; fehlende Vorschaubilder werden
+        # bei den Hintergrund-Workern angefordert (sichtbar zuerst, dann eine Seite darüber
+        # und darunter). Aufträge für weggescrollte Zeilen werden storniert.
+        if self.grid_view_var.get():
+            self.update_preview_grid()
             return
-        y_top = self.preview_canvas.canvasy(0)
-        y_bottom = y_top + canvas_height
-        visible_start = max(0, int(y_top // (int(100 * self.scaling_factor) + 4)))
-        visible_end = min(len(self.filtered_images), int(y_bottom // (int(100 * self.scaling_factor) + 4)) + 1)
-        for i in range(visible_start, visible_end):
-            frame = self.preview_items[i]
-            if not frame.winfo_children() or len(frame.winfo_children()) == 1:
-                file_path = self.filtered_images[i]
-                try:
-                    img = load_image_with_cache(file_path, self.image_cache, self.cache_limit)
-                    if img:
-                        thumb = img.copy()
-                        thumb.thumbnail((int(100 * self.scaling_factor), int(100 * self.scaling_factor)))
-                        tk_img = ImageTk.PhotoImage(thumb)
-                        self.preview_images[file_path] = tk_img
-                    else:
-                        tk_img = None
-                except Exception:
-                    tk_img = None
-                if tk_img:
-                    img_label = tk.Label(frame, image=tk_img, bg=BG_COLOR)
-                    img_label.image = tk_img
-                    img_label.pack(side="left", before=frame.winfo_children()[0])
-                    img_label.bind("<Button-1>", lambda e, idx=i: self.on_preview_click(idx))
+        total = len(self.filtered_images)
+        thumb_size = self.get_preview_thumb_size()
+        row_height = thumb_size + 2 * PREVIEW_ROW_PADDING
+        self.preview_layout = (row_height, 1)
+        self.set_preview_scrollregion(total * row_height, row_height)
+        canvas_width = max(1, self.preview_canvas.winfo_width())
+        canvas_height = max(1, self.preview_canvas.winfo_height())
+        y_top = max(0, self.preview_canvas.canvasy(0))
+        visible_start = min(total, int(y_top // row_height))
+        visible_end = min(total, int((y_top + canvas_height) // row_height) + 1)
+        widget_start = max(0, visible_start - PREVIEW_OVERSCAN_ROWS)
+        widget_end = min(total, visible_end + PREVIEW_OVERSCAN_ROWS)
+
+        while len(self.preview_rows) < widget_end - widget_start:
+            self.preview_rows.append(self.create_preview_row())
+        bound = {row.index for row in self.preview_rows if widget_start <= row.index < widget_end}
+        free_rows = [row for row in self.preview_rows if not widget_start <= row.index < widget_end]
+        for i in range(widget_start, widget_end):
+            if i not in bound:
+                self.bind_preview_row(free_rows.pop(), i, thumb_size)
+        for row in free_rows:
+            row.index = -1
+            row.file_path = None
+            self.preview_canvas.itemconfigure(row.window_id, state="hidden")
+        self.preview_rows = self.trim_preview_rows(self.preview_rows, widget_end - widget_start)
+        for row in self.preview_rows:
+            if row.index >= 0:
+                self.preview_canvas.itemconfigure(row.window_id, state="normal",
+                                                  width=canvas_width, height=row_height)
+        self.request_preview_thumbnails(visible_start, visible_end, thumb_size)
+
+    def update_preview_grid(self):
+        # Rasteransicht: Bilder und Beschriftungen sind Canvas-Items, die wie die
+        # Listenzeilen recycelt werden; nur Zellen im Sichtbereich (plus Überhang) existieren.
+        total = len(self.filtered_images)
+        thumb_size, cell_width, cell_height, columns = self.get_grid_geometry()
+        self.preview_layout = (cell_height, columns)
+        self.set_preview_scrollregion(-(-total // columns) * cell_height, cell_height)
+        canvas_height = max(1, self.preview_canvas.winfo_height())
+        y_top = max(0, self.preview_canvas.canvasy(0))
+        first_row = int(y_top // cell_height)
+        last_row = int((y_top + canvas_height) // cell_height) + 1
+        visible_start = min(total, first_row * columns)
+        visible_end = min(total, last_row * columns)
+        widget_start = max(0, (first_row - PREVIEW_OVERSCAN_ROWS) * columns)
+        widget_end = min(total, (last_row + PREVIEW_OVERSCAN_ROWS) * columns)
+        if self.atlas_view_var.get():
+            self.update_preview_atlas(total, thumb_size, cell_width, cell_height, columns, first_row, last_row)
+            self.request_preview_thumbnails(visible_start, visible_end, thumb_size)
+            return
+
+        while len(self.grid_cells) < widget_end - widget_start:
+            self.grid_cells.append(self.create_grid_cell())
+        bound = {cell.index for cell in self.grid_cells if widget_start <= cell.index < widget_end}
+        free_cells = [cell for cell in self.grid_cells if not widget_start <= cell.index < widget_end]
+        caption_chars = max(4, cell_width * 3 // (2 * self.main_font_size))
+        for i in range(widget_start, widget_end):
+            if i not in bound:
+                self.bind_grid_cell(free_cells.pop(), i, thumb_size, cell_width, cell_height, columns, caption_chars)
+        for cell in free_cells:
+            cell.index = -1
+            cell.file_path = None
+            self.preview_canvas.itemconfigure(cell.image_id, state="hidden")
+            self.preview_canvas.itemconfigure(cell.text_id, state="hidden")
+        self.grid_cells = self.trim_preview_rows(self.grid_cells, widget_end - widget_start)
+        self.request_preview_thumbnails(visible_start, visible_end, thumb_size)
+
+    def update_preview_atlas(self, total, thumb_size, cell_width, cell_height, columns, first_row, last_row):
+        # Atlas-Modus: je ATLAS_BAND_ROWS Rasterzeilen ergeben ein Canvas-Bild. Zusammengesetzt
+        # wird im Hintergrund; Klicks werden wie im Raster über die Zellkoordinaten aufgelöst.
+        band_cells = ATLAS_BAND_ROWS * columns
+        band_count = -(-total // band_cells)
+        first_band = max(0, first_row // ATLAS_BAND_ROWS - 1)
+        last_band = min(band_count, (last_row - 1) // ATLAS_BAND_ROWS + 2)
+        caption_chars = max(4, cell_width * 3 // (2 * self.main_font_size))
+        layout = (columns, thumb_size, cell_width, cell_height, caption_chars)
+        if self.atlas_font is None or self.atlas_font[0] != self.main_font_size:
+            self.atlas_font = (self.main_font_size, load_caption_font(self.main_font_size))
+
+        while len(self.atlas_bands) < last_band - first_band:
+            band = AtlasBand(next(self.preview_slot_ids))
+            band.item_id = self.preview_canvas.create_image(0, 0, anchor="nw", state="hidden")
+            self.atlas_bands.append(band)
+        bound = {band.band for band in self.atlas_bands
+                 if first_band <= band.band < last_band and band.layout == layout}
+        free_bands = [band for band in self.atlas_bands
+                      if not (first_band <= band.band < last_band and band.layout == layout)]
+        for n in range(first_band, last_band):
+            if n in bound:
+                continue
+            band = free_bands.pop()
+            band.band = n
+            band.layout = layout
+            band.paths = self.filtered_images[n * band_cells:(n + 1) * band_cells]
+            band.path_set = frozenset(band.paths)
+            self.preview_canvas.coords(band.item_id, 0, n * ATLAS_BAND_ROWS * cell_height)
+            self.preview_canvas.itemconfigure(band.item_id, state="hidden")
+            self.compose_atlas_band(band)
+        for band in free_bands:
+            band.band = -1
+            band.pending = False
+            self.preview_canvas.itemconfigure(band.item_id, state="hidden")
+
+    def compose_atlas_band(self, band):
+        # Vorschaubilder im Hauptthread aus dem Cache holen (der Cache ist nicht threadsicher),
+        # das Zusammensetzen der Seite übernimmt ein Hintergrund-Thread.
+        columns, thumb_size, cell_width, cell_height, caption_chars = band.layout
+        thumbs = [self.thumb_cache.get(path, thumb_size) for path in band.paths]
+        names = [shorten_caption(os.path.basename(path), caption_chars) for path in band.paths]
+        band.version += 1
+        band.pending = True
+        job = (band, band.version)
+        font = self.atlas_font[1]
+
+        def task():
+            try:
+                page = compose_atlas_page(thumbs, names, columns, ATLAS_BAND_ROWS,
+                                          thumb_size, cell_width, cell_height, font)
+            except Exception as e:
+                print(f"Fehler beim Zusammensetzen der Atlas-Seite: {e}")
+                page = None
+            self.atlas_results.put((job, page))
+
+        threading.Thread(target=task, daemon=True).start()
+        if self.thumb_poll_job is None:
+            self.thumb_poll_job = self.after(THUMBNAIL_POLL_MS, self.flush_thumbnail_results)
+
+    def apply_atlas_results(self):
+        while True:
+            try:
+                (band, version), page = self.atlas_results.get_nowait()
+            except queue.Empty:
+                break
+            # Veraltete Ergebnisse (Seite inzwischen neu gebunden oder freigegeben) verwerfen
+            if band.version != version or band.band < 0 or band not in self.atlas_bands:
+                continue
+            band.pending = False
+            if page is None:
+                continue
+            try:
+                photo = get_pooled_photo(self.photo_pool, ("atlas", band.slot), page)
+                self.preview_canvas.itemconfigure(band.item_id, image=photo, state="normal")
+            except tk.TclError:
+                pass
+
+    def create_grid_cell(self):
+        cell = PreviewGridCell(next(self.preview_slot_ids))
+        cell.image_id = self.preview_canvas.create_image(0, 0, anchor="nw", state="hidden")
+        cell.text_id = self.preview_canvas.create_text(0, 0, anchor="n", state="hidden", fill=TEXT_FG_COLOR,
+                                                       font=("Arial", self.main_font_size))
+        return cell
+
+    def bind_grid_cell(self, cell, index, thumb_size, cell_width, cell_height, columns, caption_chars):
+        cell.index = index
+        cell.file_path = self.filtered_images[index]
+        x = (index % columns) * cell_width + PREVIEW_ROW_PADDING
+        y = (index // columns) * cell_height + PREVIEW_ROW_PADDING
+        name = shorten_caption(os.path.basename(cell.file_path), caption_chars)
+        self.preview_canvas.coords(cell.image_id, x, y)
+        self.preview_canvas.coords(cell.text_id, x + thumb_size // 2, y + thumb_size + 2)
+        self.preview_canvas.itemconfigure(cell.text_id, text=name, state="normal")
+        thumb = self.thumb_cache.get(cell.file_path, thumb_size)
+        if thumb is not None:
+            self.show_preview_thumbnail(cell, thumb, thumb_size)
+        else:
+            self.preview_canvas.itemconfigure(cell.image_id, image=self.get_thumbnail_placeholder(thumb_size),
+                                              state="normal")
+            cell.thumb_loaded = False
+
+    def on_preview_grid_click(self, event):
+        # Im Raster gibt es keine Widgets pro Zelle: Index aus der Klickposition berechnen
+        if not self.grid_view_var.get():
+            return
+        _, cell_width, cell_height, columns = self.get_grid_geometry()
+        column = int(self.preview_canvas.canvasx(event.x) // cell_width)
+        row = int(self.preview_canvas.canvasy(event.y) // cell_height)
+        if column < columns:
+            self.on_preview_click(row * columns + column)
+
+    def request_preview_thumbnails(self, visible_start, visible_end, thumb_size):
+        total = len(self.filtered_images)
+        page = max(1, visible_end - visible_start)
+        wanted = set()
+        # Erzeugt wird immer eine ganze Stufe; die Anzeigegröße wird daraus im Cache abgeleitet
+        level = thumbnail_level(thumb_size)
+        for i in range(max(0, visible_start - page), min(total, visible_end + page)):
+            file_path = self.filtered_images[i]
+            if self.thumb_cache.covers(file_path, thumb_size):
+                continue
+            wanted.add((file_path, level))
+            self.thumb_workers.request(file_path, level, 0 if visible_start <= i < visible_end else 1)
+        self.thumb_workers.cancel_except(wanted)
+        if wanted and self.thumb_poll_job is None:
+            self.thumb_poll_job = self.after(THUMBNAIL_POLL_MS, self.flush_thumbnail_results)
+
+    def flush_thumbnail_results(self):
+        # Gesammelte Ergebnisse der Worker in einem Rutsch übernehmen
+        self.thumb_poll_job = None
+        thumb_size = self.get_preview_thumb_size()
+        dirty_bands = set()
+        for (file_path, size), levels in self.thumb_workers.drain():
+            if not levels:
+                continue
+            for level, thumb in sorted(levels.items()):
+                self.thumb_cache.put(file_path, level, thumb)
+            if size != thumbnail_level(thumb_size):
+                continue
+            thumb = self.thumb_cache.get(file_path, thumb_size)
+            for band in self.atlas_bands:
+                if band.band >= 0 and file_path in band.path_set:
+                    dirty_bands.add(band)
+            for row in self.grid_cells if self.grid_view_var.get() else self.preview_rows:
+                if row.index >= 0 and row.file_path == file_path and not row.thumb_loaded:
+                    self.show_preview_thumbnail(row, thumb, thumb_size)
+        # Pro Abfrage wird jede betroffene Atlas-Seite höchstens einmal neu zusammengesetzt
+        for band in dirty_bands:
+            self.compose_atlas_band(band)
+        self.apply_atlas_results()
+        pending = self.thumb_workers.has_pending() or any(band.pending for band in self.atlas_bands)
+        if pending and self.thumb_poll_job is None:
+            self.thumb_poll_job = self.after(THUMBNAIL_POLL_MS, self.flush_thumbnail_results)
+
+    def show_preview_thumbnail(self, row, thumb, thumb_size):
+        # row ist eine Listenzeile (Frame) oder eine Rasterzelle (Canvas-Items)
+        try:
+            # Auf feste Zellgröße auffüllen, damit das PhotoImage der Zeile wiederverwendet wird
+            if isinstance(row, PreviewGridCell):
+                tk_img = get_pooled_photo(self.photo_pool, ("grid", row.slot), pad_thumbnail(thumb, thumb_size))
+                self.preview_canvas.itemconfigure(row.image_id, image=tk_img, state="normal")
+            else:
+                tk_img = get_pooled_photo(self.photo_pool, ("preview", row.slot), pad_thumbnail(thumb, thumb_size))
+                row.thumb_label.config(image=tk_img)
+        except tk.TclError:
+            return
+        row.thumb_loaded = True
+
+    def get_thumbnail_placeholder(self, thumb_size):
+        key = ("placeholder", thumb_size)
+        if key not in self.photo_pool:
+            # Platzhalter früherer Zellgrößen werden nicht mehr gebraucht
+            for stale in [k for k in self.photo_pool if isinstance(k, tuple) and k[0] == "placeholder"]:
+                del self.photo_pool[stale]
+            get_pooled_photo(self.photo_pool, key,
+                             Image.new("RGB", (thumb_size, thumb_size), THUMBNAIL_PLACEHOLDER_COLOR))
+        return self.photo_pool[key][0]
 
     def on_preview_click(self, index):
         if 0 <= index < len(self.filtered_images):
@@ -1868,9 +4142,11 @@ class ImageManagerForm(TkinterDnD.Tk):
             new_width = int(orig_width * fit_factor)
             new_height = int(orig_height * fit_factor)
 
-        self.resized_image = self.current_image.resize((new_width, new_height), Image.LANCZOS)
-        self.tk_image = ImageTk.PhotoImage(self.resized_image)
-        self.image_label.config(image=self.tk_image)
+        new_width, new_height = max(1, new_width), max(1, new_height)
+        if not self.render_progressive("main", self.image_label, file_path, (new_width, new_height),
+                                       lambda: getattr(self, "current_image_path", None) == file_path):
+            return
+        self.scroll_preview_to_current()
         self.status(f"Image loaded: {os.path.basename(file_path)}")
         try:
             ctime = self.ctime_cache[file_path]
@@ -1879,21 +4155,72 @@ class ImageManagerForm(TkinterDnD.Tk):
             created_str = "Unknown"
         info_text = f"Filename: {os.path.basename(file_path)}\nPath: {file_path}\nCreated: {created_str}"
         self.image_info_label.config(text=info_text)
-        self.image_frame.update_idletasks()
-        orig_width, orig_height = self.current_image.size
 
-        self.resized_image = self.current_image.resize((new_width, new_height), Image.LANCZOS)
-        self.tk_image = ImageTk.PhotoImage(self.resized_image)
-        self.image_label.config(image=self.tk_image)
-        self.current_image_path = file_path
-        self.status(f"Image loaded: {os.path.basename(file_path)}")
-        try:
-            ctime = self.ctime_cache[file_path]
-            created_str = datetime.fromtimestamp(ctime).strftime("%Y-%m-%d %H:%M:%S")
-        except Exception:
-            created_str = "Unknown"
-        info_text = f"Filename: {os.path.basename(file_path)}\nPath: {file_path}\nCreated: {created_str}"
-        self.image_info_label.config(text=info_text)
+    def render_progressive(self, surface, label, file_path, size, is_current, visible=None):
+        # Phase 1: reduziert dekodieren und schnell (BILINEAR) skalieren, sofort anzeigen.
+        # Phase 2: LANCZOS-Verfeinerung nach kurzer Ruhezeit; wird abgebrochen, sobald
+        # für dieselbe Fläche ein neues Bild gerendert wird oder is_current() False liefert.
+        # Fertige Frames landen im Frame-Cache und werden flächenübergreifend wiederverwendet.
+        # visible: sichtbare Fläche; größere (gezoomte) Bilder werden darauf zugeschnitten.
+        self.cancel_refine(surface)
+        crop = frame_crop(size, visible)
+        timing = {"file": os.path.basename(file_path), "size": size,
+                  "decode": None, "preview": None, "refine": None, "cache": "miss"}
+        self.render_timings[surface] = timing
+        final_key = (file_path, size, crop, RENDER_FINAL_RESAMPLE)
+        frame = get_cached_frame(self.frame_cache, final_key)
+        if frame is not None:
+            self.show_frame(surface, label, frame)
+            timing["cache"] = "final hit"
+            return True
+
+        preview_key = (file_path, size, crop, RENDER_PREVIEW_RESAMPLE)
+        source = None
+        frame = get_cached_frame(self.frame_cache, preview_key)
+        if frame is not None:
+            timing["cache"] = "preview hit"
+        else:
+            t_start = time.perf_counter()
+            source = load_reduced_image(file_path, size)
+            if source is None:
+                self.status(f"Fehler beim Laden von Bild: {file_path}")
+                return False
+            t_decoded = time.perf_counter()
+            frame = render_frame(source, size, crop, RENDER_PREVIEW_RESAMPLE)
+            store_cached_frame(self.frame_cache, preview_key, frame, self.frame_cache_budget)
+            timing["decode"] = (t_decoded - t_start) * 1000
+            timing["preview"] = (time.perf_counter() - t_decoded) * 1000
+        self.show_frame(surface, label, frame)
+
+        def refine():
+            self.refine_jobs.pop(surface, None)
+            if not is_current():
+                return
+            t_refine = time.perf_counter()
+            refine_source = source if source is not None else load_reduced_image(file_path, size)
+            if refine_source is None:
+                return
+            final_frame = render_frame(refine_source, size, crop, RENDER_FINAL_RESAMPLE)
+            self.frame_cache.pop(preview_key, None)
+            store_cached_frame(self.frame_cache, final_key, final_frame, self.frame_cache_budget)
+            try:
+                self.show_frame(surface, label, final_frame)
+            except tk.TclError:
+                return
+            timing["refine"] = (time.perf_counter() - t_refine) * 1000
+
+        self.refine_jobs[surface] = self.after(REFINE_DELAY_MS, refine)
+        return True
+
+    def cancel_refine(self, surface):
+        job = self.refine_jobs.pop(surface, None)
+        if job is not None:
+            self.after_cancel(job)
+
+    def show_frame(self, surface, label, frame):
+        # Der Pool hält die Referenz pro Fläche, sonst gibt Tk das Bild sofort wieder frei
+        photo = get_pooled_photo(self.photo_pool, surface, frame)
+        label.config(image=photo)
 
     def rescale_image(self, value=None):
         if self.current_image:
@@ -1934,18 +4261,14 @@ class ImageManagerForm(TkinterDnD.Tk):
             return
         def continue_after_delete():
             try:
-                delete_index = self.filtered_images.index(normalized_path)
+                delete_index = self.filtered_positions.index(normalized_path)
                 next_index = delete_index
                 if next_index >= len(self.filtered_images) - 1:
                     next_index = len(self.filtered_images) - 2
                 if next_index < 0:
                     next_index = 0
                 send2trash(normalized_path)
-                self.folder_images.remove(normalized_path)
-                self.ctime_cache.pop(normalized_path, None)
-                self.text_chunks_cache.pop(normalized_path, None)
-                self.preview_images.pop(normalized_path, None)
-                self.apply_filter()
+                self.remove_image_from_lists(normalized_path)
                 if self.filtered_images:
                     self.current_index = next_index
                     self.display_image_safe_async(self.filtered_images[self.current_index])
@@ -2052,8 +4375,8 @@ class ImageManagerForm(TkinterDnD.Tk):
             self.fs_copy_settings_button = None
 
             self.focus_force()
-            if update_main and hasattr(self, "fs_image_path") and self.fs_image_path in self.filtered_images:
-                self.current_index = validate_index(self.filtered_images.index(self.fs_image_path), self.filtered_images)
+            if update_main and hasattr(self, "fs_image_path") and self.fs_image_path in self.filtered_positions:
+                self.current_index = validate_index(self.filtered_positions.index(self.fs_image_path), self.filtered_images)
                 self.display_image_safe_async(self.fs_image_path)
                 self.extract_and_display_text_chunks(self.fs_image_path)
         except tk.TclError:
@@ -2101,24 +4424,24 @@ class ImageManagerForm(TkinterDnD.Tk):
                 self.fullscreen_win.after(100, self.update_fs_image)
                 return
             orig_w, orig_h = self.fs_image.size
-            factor = min(avail_w / orig_w, avail_h / orig_h)
+            factor = min(avail_w / orig_w, avail_h / orig_h) * getattr(self, "fs_zoom", 1.0)
         except Exception:
             return
-        new_w = int(orig_w * factor)
-        new_h = int(orig_h * factor)
-        fs_resized = self.fs_image.resize((new_w, new_h), Image.LANCZOS)
-        self.fs_tk_image = ImageTk.PhotoImage(fs_resized)
-        self.fs_image_label.config(image=self.fs_tk_image)
+        new_w = max(1, int(orig_w * factor))
+        new_h = max(1, int(orig_h * factor))
+        # Reduzierte Dekodierung; beim Hineinzoomen wird mit feinerer Stufe neu dekodiert
+        fs_path = self.fs_image_path
+        self.render_progressive("fs", self.fs_image_label, fs_path, (new_w, new_h),
+                                lambda: bool(self.fullscreen_win and self.fullscreen_win.winfo_exists()
+                                             and self.fs_image_path == fs_path),
+                                visible=(avail_w, avail_h))
         self.update_fs_info_fullscreen()
 
 
     def fullscreen_zoom(self, event):
         try:
             factor = 1.1 if event.delta > 0 else 0.9
-            orig = Image.open(self.fs_image_path)
-            new_w = int(orig.width * factor)
-            new_h = int(orig.height * factor)
-            self.fs_image = orig.resize((new_w, new_h))
+            self.fs_zoom = max(0.1, min(8.0, getattr(self, "fs_zoom", 1.0) * factor))
             self.update_fs_image()
         except tk.TclError:
             pass
@@ -2138,6 +4461,7 @@ class ImageManagerForm(TkinterDnD.Tk):
             self.fs_current_index += 1
             self.fs_current_index = validate_index(self.fs_current_index, self.filtered_images)
             self.fs_image_path = self.filtered_images[self.fs_current_index]
+            self.fs_zoom = 1.0
             try:
                 self.fs_image = Image.open(self.fs_image_path)
             except Exception as e:
@@ -2152,6 +4476,7 @@ class ImageManagerForm(TkinterDnD.Tk):
             self.fs_current_index -= 1
             self.fs_current_index = validate_index(self.fs_current_index, self.filtered_images)
             self.fs_image_path = self.filtered_images[self.fs_current_index]
+            self.fs_zoom = 1.0
             try:
                 self.fs_image = Image.open(self.fs_image_path)
             except Exception as e:
@@ -2250,19 +4575,16 @@ class ImageManagerForm(TkinterDnD.Tk):
             return
         def continue_after_delete():
             try:
-                delete_index = self.filtered_images.index(normalized_path)
+                delete_index = self.filtered_positions.index(normalized_path)
                 send2trash(normalized_path)
-                self.folder_images.remove(normalized_path)
-                self.ctime_cache.pop(normalized_path, None)
-                self.text_chunks_cache.pop(normalized_path, None)
-                self.preview_images.pop(normalized_path, None)
-                self.apply_filter()
+                self.remove_image_from_lists(normalized_path)
                 if len(self.filtered_images) == 0:
                     self.safe_close_fullscreen()
                     return
                 next_index = delete_index
                 self.fs_current_index = validate_index(next_index, self.filtered_images)
                 self.fs_image_path = self.filtered_images[self.fs_current_index]
+                self.fs_zoom = 1.0
                 self.fs_image = Image.open(self.fs_image_path)
                 self.update_fs_image()
                 self.update_fs_info_fullscreen()
@@ -2305,11 +4627,11 @@ class ImageManagerForm(TkinterDnD.Tk):
             """
             if self.current_image:
                 orig_width, orig_height = self.current_image.size
-                new_width = int(orig_width * scale_factor)
-                new_height = int(orig_height * scale_factor)
-                self.resized_image = self.current_image.resize((new_width, new_height), Image.LANCZOS)
-                self.tk_image = ImageTk.PhotoImage(self.resized_image)
-                self.image_label.config(image=self.tk_image)
+                new_width = max(1, int(orig_width * scale_factor))
+                new_height = max(1, int(orig_height * scale_factor))
+                file_path = self.current_image_path
+                self.render_progressive("main", self.image_label, file_path, (new_width, new_height),
+                                        lambda: self.current_image_path == file_path)
                 self.status(f"Image scaled to {int(scale_factor * 100)}%")
 
 
@@ -2357,6 +4679,7 @@ class ImageManagerForm(TkinterDnD.Tk):
             return
         self.fs_current_index = self.current_index
         self.fs_image_path = self.filtered_images[self.fs_current_index]
+        self.fs_zoom = 1.0
         try:
             self.fs_image = load_image_with_cache(self.fs_image_path, self.image_cache, self.cache_limit)
         except Exception as e:
@@ -2455,6 +4778,9 @@ def load_history():
     return {"folder_history": [], "filter_history": []}
 
 if __name__ == "__main__":
+    if len(sys.argv) >= 3 and sys.argv[1] == "--benchmark-thumbnails":
+        benchmark_thumbnail_backends(sys.argv[2], limit=int(sys.argv[3]) if len(sys.argv) > 3 else 500)
+        sys.exit(0)
     load_options_settings()  # Lädt den gespeicherten Multiplikator (falls vorhanden)
     app = ImageManagerForm()
     app.mainloop()